@@ -16,10 +16,12 @@ This script scans GitLab CI/CD YAML files for security issues:
 import sys
 import yaml
 import re
-import json
 from pathlib import Path
-from typing import Dict, List, Any, Pattern
-from collections import defaultdict
+from typing import Dict, List, Any, Optional, Pattern, Tuple
+
+# Report separators for the text output
+BANNER = '=' * 80
+RULE = '-' * 80
 
 
 class SecurityIssue:
@@ -33,10 +35,11 @@ class SecurityIssue:
         self.remediation = remediation
 
     def __str__(self):
-        result = f"{self.severity.upper()}: Line {self.line}: {self.message} [{self.rule}]"
+        parts = [self.severity.upper(), ': Line ', str(self.line), ': ', self.message, ' [', self.rule, ']']
         if self.remediation:
-            result += f"\n  🔒 Remediation: {self.remediation}"
-        return result
+            parts.append('\n  🔒 Remediation: ')
+            parts.append(self.remediation)
+        return ''.join(parts)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON output"""
@@ -782,54 +785,64 @@ class SecurityScanner:
         if not isinstance(variables, dict):
             return
 
-        if 'GIT_STRATEGY' in variables:
-            strategy = variables['GIT_STRATEGY']
+        strategy = variables.get('GIT_STRATEGY')
+        if strategy is None:
+            return
 
-            # Warn about 'none' strategy with external scripts
-            if strategy == 'none':
-                self.issues.append(SecurityIssue(
-                    'medium',
-                    line,
-                    f"Git strategy 'none' in {context} may execute untrusted code",
-                    'git-strategy-none',
-                    "Strategy 'none' skips repository cloning; ensure scripts come from trusted sources"
-                ))
+        # Warn about 'none' strategy with external scripts
+        if strategy == 'none':
+            self.issues.append(SecurityIssue(
+                'medium',
+                line,
+                f"Git strategy 'none' in {context} may execute untrusted code",
+                'git-strategy-none',
+                "Strategy 'none' skips repository cloning; ensure scripts come from trusted sources"
+            ))
 
-            # Warn about 'fetch' without depth limit
-            if strategy == 'fetch':
-                if 'GIT_DEPTH' not in variables:
-                    self.issues.append(SecurityIssue(
-                        'low',
-                        line,
-                        f"Git strategy 'fetch' in {context} without GIT_DEPTH may be inefficient",
-                        'git-strategy-fetch-no-depth',
-                        "Consider setting GIT_DEPTH to limit history and improve performance"
-                    ))
+        # Warn about 'fetch' without depth limit
+        elif strategy == 'fetch' and 'GIT_DEPTH' not in variables:
+            self.issues.append(SecurityIssue(
+                'low',
+                line,
+                f"Git strategy 'fetch' in {context} without GIT_DEPTH may be inefficient",
+                'git-strategy-fetch-no-depth',
+                "Consider setting GIT_DEPTH to limit history and improve performance"
+            ))
 
-def main():
-    """Main entry point"""
 
-    if len(sys.argv) < 2:
-        print("Usage: check_security.py <gitlab-ci.yml> [--json]", file=sys.stderr)
-        sys.exit(1)
+def _scan_one(file_path: str) -> Tuple[str, List[SecurityIssue]]:
+    """Scan a single file; module-level so it can run in a worker process"""
+    return file_path, SecurityScanner(file_path).scan()
+
 
-    file_path = sys.argv[1]
-    json_output = '--json' in sys.argv
+def _build_report(file_path: str, issues: List[SecurityIssue], json_output: bool) -> Tuple[Any, bool]:
+    """Build the JSON result dict or text report for one file.
 
-    scanner = SecurityScanner(file_path)
-    issues = scanner.scan()
+    Returns the report and whether critical or high severity issues were found.
+    """
+
+    # Clean scans skip severity grouping and report formatting entirely
+    if not issues:
+        if json_output:
+            return {
+                'validator': 'security',
+                'file': file_path,
+                'success': True,
+                'issues': [],
+                'summary': {'critical': 0, 'high': 0, 'medium': 0, 'low': 0}
+            }, False
+        return f"✓ No security issues found in {file_path}\n", False
 
     # Group by severity
-    by_severity = defaultdict(list)
+    by_severity: Dict[str, List[SecurityIssue]] = {}
     for issue in issues:
-        by_severity[issue.severity].append(issue)
+        by_severity.setdefault(issue.severity, []).append(issue)
 
     # Determine if scan passed (no critical or high issues)
     has_critical_or_high = bool(by_severity.get('critical') or by_severity.get('high'))
 
     if json_output:
-        # Output JSON format
-        result = {
+        return {
             'validator': 'security',
             'file': file_path,
             'success': not has_critical_or_high,
@@ -840,40 +853,100 @@ def main():
                 'medium': len(by_severity.get('medium', [])),
                 'low': len(by_severity.get('low', []))
             }
-        }
-        print(json.dumps(result, indent=2))
+        }, has_critical_or_high
+
+    # Output formatted text
+    out = [f"\n{BANNER}\n", f"Security Scan for: {file_path}\n", f"{BANNER}\n\n"]
+
+    # Print in severity order
+    for severity in ['critical', 'high', 'medium', 'low']:
+        if severity in by_severity:
+            out.append(f"\n{severity.upper()} SEVERITY ({len(by_severity[severity])}):\n")
+            out.append(f"{RULE}\n")
+            for issue in by_severity[severity]:
+                out.append(f"  {issue}\n\n")
+
+    out.append(f"{BANNER}\n")
+    out.append(f"Summary: "
+               f"{len(by_severity.get('critical', []))} critical, "
+               f"{len(by_severity.get('high', []))} high, "
+               f"{len(by_severity.get('medium', []))} medium, "
+               f"{len(by_severity.get('low', []))} low\n")
+    out.append(f"{BANNER}\n\n")
+
+    # Exit with error if critical or high issues found
+    if has_critical_or_high:
+        out.append("❌ Security scan found critical or high severity issues\n")
     else:
-        # Output formatted text
-        if issues:
-            print(f"\n{'='*80}")
-            print(f"Security Scan for: {file_path}")
-            print(f"{'='*80}\n")
-
-            # Print in severity order
-            for severity in ['critical', 'high', 'medium', 'low']:
-                if severity in by_severity:
-                    print(f"\n{severity.upper()} SEVERITY ({len(by_severity[severity])}):")
-                    print("-" * 80)
-                    for issue in by_severity[severity]:
-                        print(f"  {issue}\n")
-
-            print(f"{'='*80}")
-            print(f"Summary: "
-                  f"{len(by_severity.get('critical', []))} critical, "
-                  f"{len(by_severity.get('high', []))} high, "
-                  f"{len(by_severity.get('medium', []))} medium, "
-                  f"{len(by_severity.get('low', []))} low")
-            print(f"{'='*80}\n")
-
-            # Exit with error if critical or high issues found
-            if has_critical_or_high:
-                print("❌ Security scan found critical or high severity issues")
-            else:
-                print("⚠️  Security scan found medium/low severity issues")
-        else:
-            print(f"✓ No security issues found in {file_path}")
+        out.append("⚠️  Security scan found medium/low severity issues\n")
+
+    return ''.join(out), has_critical_or_high
+
+
+def _scan_parallel(file_paths: List[str], jobs: Optional[int]) -> List[Tuple[str, List[SecurityIssue]]]:
+    """Scan several files across worker processes, preserving input order"""
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    # Forked workers inherit the already-imported yaml module and compiled patterns
+    mp_context = None
+    if sys.platform.startswith('linux'):
+        mp_context = multiprocessing.get_context('fork')
+
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=mp_context) as executor:
+        return list(executor.map(_scan_one, file_paths))
+
+
+def main():
+    """Main entry point"""
+
+    usage = "Usage: check_security.py <gitlab-ci.yml> [<gitlab-ci.yml> ...] [--json] [--jobs N]"
+
+    args = sys.argv[1:]
+    json_output = '--json' in args
+    jobs: Optional[int] = None
+    file_paths: List[str] = []
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '--jobs':
+            if i + 1 >= len(args) or not args[i + 1].isdigit() or int(args[i + 1]) < 1:
+                print("Error: --jobs requires a positive integer", file=sys.stderr)
+                sys.exit(1)
+            jobs = int(args[i + 1])
+            i += 2
+            continue
+        if arg != '--json':
+            file_paths.append(arg)
+        i += 1
+
+    if not file_paths:
+        print(usage, file=sys.stderr)
+        sys.exit(1)
+
+    if len(file_paths) == 1:
+        results = [_scan_one(file_paths[0])]
+    else:
+        results = _scan_parallel(file_paths, jobs)
+
+    reports = []
+    failed = False
+    for file_path, issues in results:
+        report, has_critical_or_high = _build_report(file_path, issues, json_output)
+        reports.append(report)
+        failed = failed or has_critical_or_high
+
+    if json_output:
+        import json  # only needed for --json output
+
+        # A single file keeps the original object output; batches emit a list
+        payload = reports[0] if len(reports) == 1 else reports
+        print(json.dumps(payload, indent=2))
+    else:
+        sys.stdout.write('\n'.join(reports) if len(reports) > 1 else reports[0])
 
-    sys.exit(1 if has_critical_or_high else 0)
+    sys.exit(1 if failed else 0)
 
 
 if __name__ == '__main__':
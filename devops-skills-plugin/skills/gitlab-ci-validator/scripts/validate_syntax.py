@@ -16,50 +16,219 @@ import yaml
 import re
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Tuple, Set
-from collections import defaultdict
+from typing import Dict, List, Any, Tuple, Set, FrozenSet, NamedTuple, Optional, Sequence
+from collections import Counter, deque
 
+# Prefer the libyaml-backed loader; fall back to the pure-Python one when
+# PyYAML was built without libyaml. Both construct identical Python objects.
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
-class ValidationError:
+
+class _LineLoader(SafeLoader):
+    """SafeLoader that records the line of each top-level mapping key"""
+
+    def __init__(self, stream):
+        super().__init__(stream)
+        self.key_lines: Dict[Any, int] = {}
+
+    def construct_document(self, node):
+        # The parser already tracked exact positions; keep them for the root keys
+        if isinstance(node, yaml.MappingNode):
+            for key_node, _ in node.value:
+                if isinstance(key_node, yaml.ScalarNode):
+                    self.key_lines[key_node.value] = key_node.start_mark.line + 1
+        return super().construct_document(node)
+
+
+class ValidationError(NamedTuple):
     """Represents a validation error or warning"""
 
-    def __init__(self, severity: str, line: int, message: str, rule: str):
-        self.severity = severity  # 'error', 'warning', 'info'
-        self.line = line
-        self.message = message
-        self.rule = rule
+    severity: str  # 'error', 'warning', 'info'
+    line: int
+    message: str
+    rule: str
 
     def __str__(self):
         return f"{self.severity.upper()}: Line {self.line}: {self.message} [{self.rule}]"
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON output"""
-        return {
-            'severity': self.severity,
-            'line': self.line,
-            'message': self.message,
-            'rule': self.rule
-        }
+        return self._asdict()
+
+
+def _find_cycles(nodes: List[str], edges: Dict[str, Sequence[str]]) -> List[List[str]]:
+    """Find one cycle per strongly connected component of a directed graph.
+
+    Uses an iterative Tarjan SCC pass so deep graphs cannot hit the recursion
+    limit. Each cycle starts and ends at the SCC member that appears first in
+    ``nodes``, e.g. ``['a', 'b', 'a']``; cycles are returned in that order.
+    """
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    components: List[List[str]] = []
+
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(edges.get(root, ())))]
+
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(edges.get(child, ()))))
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    position = {node: i for i, node in enumerate(nodes)}
+    cycles = []
+    for component in components:
+        start = min(component, key=position.__getitem__)
+        if len(component) == 1 and start not in edges.get(start, ()):
+            continue
+
+        # Breadth-first search inside the component for the shortest way back to start
+        members = set(component)
+        parents: Dict[str, str] = {}
+        queue = deque([start])
+        last = None
+        while queue and last is None:
+            node = queue.popleft()
+            for child in edges.get(node, ()):
+                if child == start:
+                    last = node
+                    break
+                if child in members and child not in parents:
+                    parents[child] = node
+                    queue.append(child)
+
+        path = [last]
+        while path[-1] != start:
+            path.append(parents[path[-1]])
+        path.reverse()
+        path.append(start)
+        cycles.append(path)
+
+    cycles.sort(key=lambda cycle: position[cycle[0]])
+    return cycles
+
+
+def _find_extends_cycles(nodes: List[str], edges: Dict[str, Sequence[str]]) -> List[List[str]]:
+    """Return every cycle closed by a back edge in a depth-first walk.
+
+    Walks ``nodes`` in order with an explicit stack, ignoring edges to names
+    outside ``nodes``. Nodes are indexed so the visited and on-stack flags fit
+    in two bytearrays. Each cycle starts and ends at the same job, e.g.
+    ``['a', 'b', 'a']``; the list is empty if the graph is acyclic.
+    """
+    index = {node: i for i, node in enumerate(nodes)}
+    visited = bytearray(len(nodes))
+    in_stack = bytearray(len(nodes))
+    cycles: List[List[str]] = []
+
+    for root in nodes:
+        i = index[root]
+        if visited[i]:
+            continue
+        visited[i] = in_stack[i] = 1
+        path = [root]
+        work = [iter(edges.get(root, ()))]
+
+        while work:
+            for child in work[-1]:
+                i = index.get(child)
+                if i is None:
+                    continue
+                if in_stack[i]:
+                    cycles.append(path[path.index(child):] + [child])
+                elif not visited[i]:
+                    visited[i] = in_stack[i] = 1
+                    path.append(child)
+                    work.append(iter(edges.get(child, ())))
+                    break
+            else:
+                in_stack[index[path.pop()]] = 0
+                work.pop()
+
+    return cycles
+
+
+def _extends_depths(nodes: List[str], edges: Dict[str, Sequence[str]]) -> Dict[str, int]:
+    """Return the length of the longest extends chain below each node.
+
+    A node with no extends has depth 0; otherwise its depth is one more than
+    the deepest node it extends (names outside ``nodes`` count as 0). Depths
+    are filled in topological order (Kahn's algorithm), so every edge is
+    looked at once. Nodes on or above a cycle get no depth.
+    """
+    pending: Dict[str, int] = {}
+    dependents: Dict[str, List[str]] = {node: [] for node in nodes}
+    for node in nodes:
+        targets = [target for target in edges.get(node, ()) if target in dependents]
+        pending[node] = len(targets)
+        for target in targets:
+            dependents[target].append(node)
+
+    depth: Dict[str, int] = {}
+    queue = deque(node for node in nodes if not pending[node])
+    while queue:
+        node = queue.popleft()
+        children = edges.get(node, ())
+        depth[node] = 1 + max(
+            (depth[child] for child in children if child in depth), default=0
+        ) if children else 0
+        for dependent in dependents[node]:
+            pending[dependent] -= 1
+            if not pending[dependent]:
+                queue.append(dependent)
+
+    return depth
 
 
 class GitLabCIValidator:
     """Validates GitLab CI/CD configuration files"""
 
     # Reserved keywords that cannot be used as job names
-    RESERVED_KEYWORDS = {
+    RESERVED_KEYWORDS = frozenset({
         'image', 'services', 'stages', 'types', 'before_script',
         'after_script', 'variables', 'cache', 'include', 'pages',
         'default', 'workflow', 'spec'
-    }
+    })
 
     # Global keywords that can appear at the top level
-    GLOBAL_KEYWORDS = {
+    GLOBAL_KEYWORDS = frozenset({
         'default', 'include', 'stages', 'variables', 'workflow',
         'spec', 'pages'
-    }
+    })
 
     # Valid job keywords
-    JOB_KEYWORDS = {
+    JOB_KEYWORDS = frozenset({
         'script', 'image', 'services', 'before_script', 'after_script',
         'stage', 'only', 'except', 'rules', 'tags', 'allow_failure',
         'when', 'dependencies', 'needs', 'artifacts', 'cache',
@@ -68,25 +237,119 @@ class GitLabCIValidator:
         'resource_group', 'release', 'secrets', 'identity',
         'manual_confirmation', 'inherit', 'pages', 'dast_configuration',
         'run', 'hooks', 'id_tokens'
-    }
+    })
 
     # Valid when values
-    VALID_WHEN_VALUES = {
+    VALID_WHEN_VALUES = frozenset({
         'on_success', 'on_failure', 'always', 'manual', 'delayed', 'never'
+    })
+
+    VALID_RULE_KEYWORDS = frozenset({
+        'if', 'changes', 'exists', 'when', 'allow_failure',
+        'variables', 'needs', 'start_in'
+    })
+
+    # Valid artifacts keywords
+    ARTIFACT_KEYWORDS = frozenset({
+        'paths', 'exclude', 'expire_in', 'expose_as', 'name',
+        'untracked', 'when', 'reports', 'public'
+    })
+
+    # Valid cache keywords and policies
+    CACHE_KEYWORDS = frozenset({
+        'paths', 'key', 'untracked', 'policy', 'when', 'fallback_keys'
+    })
+    CACHE_POLICIES = frozenset({'pull', 'push', 'pull-push'})
+
+    # Valid hooks keywords
+    HOOK_KEYWORDS = frozenset({'pre_get_sources_script'})
+
+    # Include types, in the order they are listed in messages
+    INCLUDE_TYPES = ('component', 'local', 'remote', 'template', 'project')
+    _INCLUDE_TYPE_KEYS = frozenset(INCLUDE_TYPES)
+
+    # Keywords allowed alongside each include type
+    COMPONENT_INCLUDE_KEYWORDS = frozenset({'component', 'inputs', 'rules'})
+    REMOTE_INCLUDE_KEYWORDS = frozenset({'remote', 'rules'})
+    TEMPLATE_INCLUDE_KEYWORDS = frozenset({'template', 'rules'})
+    PROJECT_INCLUDE_KEYWORDS = frozenset({'project', 'file', 'ref', 'rules'})
+
+    # Prefixes and suffixes expected on include paths
+    _YAML_EXTS = ('.yml', '.yaml')
+    _LOCAL_PATH_PREFIXES = ('/', '.')
+    _PROJECT_FILE_PREFIXES = ('/', './')
+    _HTTP_SCHEMES = ('http://', 'https://')
+
+    # Common misspellings of global keywords, mapped to the intended keyword
+    _COMMON_TYPOS = {
+        'stage': 'stages',
+        'include_': 'include',
+        'variable': 'variables'
     }
 
-    def __init__(self, file_path: str):
+    # Severities from least to most serious, for --min-severity filtering
+    SEVERITY_RANK = {'info': 0, 'warning': 1, 'error': 2}
+
+    # Characters GitLab accepts in job names
+    _JOB_NAME_RE = re.compile(r'^[a-zA-Z0-9:_. -]+$')
+
+    # Component include path variables and version formats
+    _VAR_REF_RE = re.compile(r'^\$\{?[A-Z_][A-Z0-9_]*\}?')
+    # One pass over the version: ~latest, ~1.0 (partial) or 1.0.0 / 1.0 / 1
+    _COMPONENT_VERSION_RE = re.compile(
+        r'~latest\Z|~\d+(?:\.\d+)*$|\d+(?:\.\d+){0,2}$'
+    )
+
+    def __init__(self, file_path: str, min_severity: str = 'info'):
         self.file_path = Path(file_path)
+        self.min_severity = min_severity
         self.errors: List[ValidationError] = []
+        # Findings as plain (severity, line, message, rule, args) tuples; turned
+        # into ValidationError records once, when validate() returns
+        self._raw_errors: List[Tuple[str, int, str, str, Tuple[Any, ...]]] = []
         self.config: Dict[str, Any] = {}
         self.line_map: Dict[Any, int] = {}
+        # Every mapping-valued top-level entry, and the job entries among them
+        # (including hidden templates), collected once after loading
+        self._all_entries: Dict[str, Dict[str, Any]] = {}
+        self._jobs: List[Tuple[str, Dict[str, Any]]] = []
+        self._job_names: FrozenSet[str] = frozenset()
+        # Line of every entry in _all_entries, looked up once
+        self._job_line: Dict[str, int] = {}
+        # Per-keyword validators run by _validate_job, keyed by job keyword
+        self._job_handlers = {
+            'script': self._validate_script,
+            'artifacts': self._validate_artifacts,
+            'cache': self._validate_cache,
+            'parallel': self._validate_parallel,
+            'hooks': self._validate_hooks,
+        }
+        # Include validators, keyed by include type
+        self._include_handlers = {
+            'component': self._validate_component_include,
+            'local': lambda inc, line, item_num: self._validate_local_include(inc['local'], line, item_num),
+            'remote': self._validate_remote_include,
+            'template': self._validate_template_include,
+            'project': self._validate_project_include,
+        }
 
     def validate(self) -> Tuple[bool, List[ValidationError]]:
         """Run all validations and return results"""
 
         # Step 1: Load and parse YAML
         if not self._load_yaml():
-            return False, self.errors
+            return False, self._collect_errors()
+
+        self._all_entries = {
+            key: value for key, value in self.config.items()
+            if isinstance(value, dict)
+        }
+        self._jobs = [
+            (key, value) for key, value in self._all_entries.items()
+            if key not in self.GLOBAL_KEYWORDS
+        ]
+        self._job_names = frozenset(key for key, _ in self._jobs)
+        self._job_line = {key: self.line_map.get(key, 0) for key in self._all_entries}
 
         # Step 2: Validate structure
         self._validate_structure()
@@ -113,110 +376,90 @@ class GitLabCIValidator:
         self._validate_includes()
 
         # Determine if validation passed (no errors, warnings are ok)
-        has_errors = any(e.severity == 'error' for e in self.errors)
-        return not has_errors, self.errors
+        errors = self._collect_errors()
+        has_errors = any(e.severity == 'error' for e in errors)
+        return not has_errors, errors
+
+    def _emit(self, severity: str, line: int, message: str, rule: str,
+              args: Tuple[Any, ...] = ()):
+        """Record a finding; with args, message is a %-template filled in later"""
+        self._raw_errors.append((severity, line, message, rule, args))
+
+    def _collect_errors(self) -> List[ValidationError]:
+        """Build ValidationError records for findings at or above min_severity"""
+        rank = self.SEVERITY_RANK
+        min_rank = rank[self.min_severity]
+        errors = []
+        for severity, line, message, rule, args in self._raw_errors:
+            if rank[severity] < min_rank:
+                continue
+            if args:
+                message = message % args
+            errors.append(ValidationError(severity, line, message, rule))
+        self.errors = errors
+        return errors
 
     def _load_yaml(self) -> bool:
         """Load and parse YAML file"""
         try:
-            with open(self.file_path, 'r') as f:
-                content = f.read()
+            # Read raw bytes in one call; libyaml decodes the stream itself
+            content = self.file_path.read_bytes()
 
-            # Parse YAML
-            self.config = yaml.safe_load(content)
+            # Blank files need no parser at all
+            if not content.strip():
+                self._emit('error', 1, 'Empty or invalid YAML file', 'yaml-empty')
+                return False
+
+            # Parse YAML, keeping the line number of every top-level key
+            loader = _LineLoader(content)
+            try:
+                self.config = loader.get_single_data()
+            finally:
+                loader.dispose()
+            self.line_map = loader.key_lines
 
             if self.config is None:
-                self.errors.append(ValidationError(
-                    'error', 1, 'Empty or invalid YAML file', 'yaml-empty'
-                ))
+                self._emit('error', 1, 'Empty or invalid YAML file', 'yaml-empty')
                 return False
 
             if not isinstance(self.config, dict):
-                self.errors.append(ValidationError(
-                    'error', 1, 'Root must be a dictionary/object', 'yaml-invalid-root'
-                ))
+                self._emit('error', 1, 'Root must be a dictionary/object', 'yaml-invalid-root')
                 return False
 
-            # Build line number map (approximate - YAML doesn't provide exact line numbers)
-            self._build_line_map(content)
-
             return True
 
         except yaml.YAMLError as e:
             line = getattr(e, 'problem_mark', None)
             line_num = line.line + 1 if line else 1
-            self.errors.append(ValidationError(
-                'error', line_num, f'YAML syntax error: {str(e)}', 'yaml-syntax'
-            ))
+            self._emit('error', line_num, f'YAML syntax error: {str(e)}', 'yaml-syntax')
             return False
         except FileNotFoundError:
-            self.errors.append(ValidationError(
-                'error', 0, f'File not found: {self.file_path}', 'file-not-found'
-            ))
+            self._emit('error', 0, f'File not found: {self.file_path}', 'file-not-found')
             return False
         except Exception as e:
-            self.errors.append(ValidationError(
-                'error', 0, f'Error reading file: {str(e)}', 'file-read-error'
-            ))
+            self._emit('error', 0, f'Error reading file: {str(e)}', 'file-read-error')
             return False
 
-    def _build_line_map(self, content: str):
-        """Build enhanced line number map for error reporting"""
-        lines = content.split('\n')
-        current_line = 1
-
-        for line in lines:
-            # Extract key from line if it looks like a YAML key (with any indentation)
-            match = re.match(r'^(\s*)([a-zA-Z0-9_-]+):', line)
-            if match:
-                indent_level = len(match.group(1))
-                key = match.group(2)
-
-                # Store both the base key and indented versions for better lookups
-                self.line_map[key] = current_line
-
-                # Also store with indent prefix for nested keys
-                indent_key = f"{indent_level}:{key}"
-                self.line_map[indent_key] = current_line
-
-            current_line += 1
-
     def _get_line(self, key: str) -> int:
-        """Get approximate line number for a key"""
+        """Get line number for a top-level key"""
         return self.line_map.get(key, 0)
 
-    def _find_line_for_text(self, text: str) -> int:
-        """Find line number for specific text in file"""
-        if not hasattr(self, '_file_content'):
-            try:
-                with open(self.file_path, 'r') as f:
-                    self._file_content = f.read().split('\n')
-            except:
-                return 0
-
-        for i, line in enumerate(self._file_content, 1):
-            if text in line:
-                return i
-        return 0
-
     def _validate_structure(self):
         """Validate overall structure"""
 
         # Check for common typos in global keywords
-        common_typos = {
-            'stage': 'stages',
-            'include_': 'include',
-            'variable': 'variables'
-        }
+        present = self._COMMON_TYPOS.keys() & self.config.keys()
+        if not present:
+            return
 
-        for typo, correct in common_typos.items():
-            if typo in self.config and correct not in self.config:
-                self.errors.append(ValidationError(
+        for typo, correct in self._COMMON_TYPOS.items():
+            if typo in present and correct not in self.config:
+                self._emit(
                     'warning',
                     self._get_line(typo),
                     f"Did you mean '{correct}' instead of '{typo}'?",
                     'structure-typo'
-                ))
+                )
 
     def _validate_stages(self):
         """Validate stages configuration"""
@@ -225,42 +468,41 @@ class GitLabCIValidator:
             stages = self.config['stages']
 
             if not isinstance(stages, list):
-                self.errors.append(ValidationError(
+                self._emit(
                     'error',
                     self._get_line('stages'),
                     "'stages' must be a list",
                     'stages-not-list'
-                ))
+                )
                 return
 
             if not stages:
-                self.errors.append(ValidationError(
+                self._emit(
                     'warning',
                     self._get_line('stages'),
                     "Empty 'stages' list - using default stages",
                     'stages-empty'
-                ))
+                )
 
-            # Check for duplicate stages
-            seen = set()
             for stage in stages:
                 if not isinstance(stage, str):
-                    self.errors.append(ValidationError(
+                    self._emit(
                         'error',
                         self._get_line('stages'),
                         f"Stage name must be a string, got {type(stage).__name__}",
                         'stage-invalid-type'
-                    ))
-                    continue
+                    )
 
-                if stage in seen:
-                    self.errors.append(ValidationError(
+            # Check for duplicate stages, reporting each name once
+            counts = Counter(stage for stage in stages if isinstance(stage, str))
+            for stage, count in counts.items():
+                if count > 1:
+                    self._emit(
                         'warning',
                         self._get_line('stages'),
-                        f"Duplicate stage '{stage}'",
+                        f"Duplicate stage '{stage}' ({count} times)",
                         'stage-duplicate'
-                    ))
-                seen.add(stage)
+                    )
 
     def _validate_jobs(self):
         """Validate all jobs"""
@@ -278,12 +520,12 @@ class GitLabCIValidator:
 
             # This should be a job
             if not isinstance(value, dict):
-                self.errors.append(ValidationError(
+                self._emit(
                     'error',
                     self._get_line(key),
                     f"Job '{key}' must be a dictionary",
                     'job-not-dict'
-                ))
+                )
                 continue
 
             self._validate_job(key, value, valid_stages)
@@ -291,25 +533,26 @@ class GitLabCIValidator:
     def _validate_job(self, job_name: str, job: Dict[str, Any], valid_stages: Set[str]):
         """Validate a single job"""
 
-        line = self._get_line(job_name)
+        emit = self._emit
+        line = self._job_line[job_name]
 
         # Check for reserved keywords used as job names
         if job_name in self.RESERVED_KEYWORDS:
-            self.errors.append(ValidationError(
+            emit(
                 'error',
                 line,
                 f"'{job_name}' is a reserved keyword and cannot be used as a job name",
                 'job-reserved-keyword'
-            ))
+            )
 
         # Check job name format
-        if not re.match(r'^[a-zA-Z0-9:_. -]+$', job_name):
-            self.errors.append(ValidationError(
+        if not self._JOB_NAME_RE.match(job_name):
+            emit(
                 'warning',
                 line,
                 f"Job name '{job_name}' contains unusual characters",
                 'job-name-format'
-            ))
+            )
 
         # Check for 'script' keyword (required unless it's a trigger/include job)
         has_script = 'script' in job
@@ -317,42 +560,42 @@ class GitLabCIValidator:
         has_extends = 'extends' in job
 
         if not has_script and not has_trigger and not has_extends:
-            self.errors.append(ValidationError(
+            emit(
                 'error',
                 line,
                 f"Job '{job_name}' must have 'script', 'trigger', or 'extends' keyword",
                 'job-missing-script'
-            ))
+            )
 
         # Validate 'stage' reference
         if 'stage' in job:
             stage = job['stage']
             if not isinstance(stage, str):
-                self.errors.append(ValidationError(
+                emit(
                     'error',
                     line,
                     f"Job '{job_name}': 'stage' must be a string",
                     'job-stage-invalid-type'
-                ))
+                )
             elif stage not in valid_stages:
-                self.errors.append(ValidationError(
+                emit(
                     'error',
                     line,
                     f"Job '{job_name}': references undefined stage '{stage}'",
                     'job-stage-undefined'
-                ))
+                )
 
         # Validate 'when' keyword
         if 'when' in job:
             when = job['when']
             if when not in self.VALID_WHEN_VALUES:
-                self.errors.append(ValidationError(
+                emit(
                     'error',
                     line,
                     f"Job '{job_name}': invalid 'when' value '{when}'. "
                     f"Must be one of: {', '.join(sorted(self.VALID_WHEN_VALUES))}",
                     'job-when-invalid'
-                ))
+                )
 
         # Check for mixing 'rules' with 'only'/'except'
         has_rules = 'rules' in job
@@ -360,156 +603,143 @@ class GitLabCIValidator:
         has_except = 'except' in job
 
         if has_rules and (has_only or has_except):
-            self.errors.append(ValidationError(
+            emit(
                 'error',
                 line,
                 f"Job '{job_name}': cannot use 'rules' with 'only'/'except'",
                 'job-rules-conflict'
-            ))
+            )
 
         # Warn about deprecated only/except
         if has_only or has_except:
-            self.errors.append(ValidationError(
+            emit(
                 'warning',
                 line,
                 f"Job '{job_name}': 'only'/'except' are deprecated, use 'rules' instead",
                 'job-deprecated-only-except'
-            ))
-
-        # Validate unknown keywords
-        for keyword in job.keys():
-            if keyword not in self.JOB_KEYWORDS:
-                self.errors.append(ValidationError(
+            )
+
+        # Walk the job once: flag unknown keywords and collect keyword validators
+        handlers = self._job_handlers
+        checks = []
+        has_unknown = not self.JOB_KEYWORDS.issuperset(job)
+        for keyword, value in job.items():
+            if has_unknown and keyword not in self.JOB_KEYWORDS:
+                emit(
                     'warning',
                     line,
                     f"Job '{job_name}': unknown keyword '{keyword}'",
                     'job-unknown-keyword'
-                ))
-
-        # Validate script format
-        if 'script' in job:
-            script = job['script']
-            if not isinstance(script, (str, list)):
-                self.errors.append(ValidationError(
-                    'error',
-                    line,
-                    f"Job '{job_name}': 'script' must be a string or list",
-                    'job-script-invalid-type'
-                ))
-            elif isinstance(script, list):
-                for i, cmd in enumerate(script):
-                    if not isinstance(cmd, str):
-                        self.errors.append(ValidationError(
-                            'error',
-                            line,
-                            f"Job '{job_name}': script command #{i+1} must be a string",
-                            'job-script-item-invalid'
-                        ))
-
-        # Validate artifacts
-        if 'artifacts' in job:
-            self._validate_artifacts(job_name, job['artifacts'], line)
+                )
+                continue
 
-        # Validate cache
-        if 'cache' in job:
-            self._validate_cache(job_name, job['cache'], line)
+            handler = handlers.get(keyword)
+            if handler is not None:
+                checks.append((handler, (job_name, value, line)))
+            elif keyword == 'manual_confirmation':
+                # Also needs the job itself to look at its 'when'
+                checks.append((self._validate_manual_confirmation, (job_name, value, line, job)))
 
-        # Validate parallel
-        if 'parallel' in job:
-            self._validate_parallel(job_name, job['parallel'], line)
+        for handler, args in checks:
+            handler(*args)
 
-        # Validate hooks
-        if 'hooks' in job:
-            self._validate_hooks(job_name, job['hooks'], line)
+    def _validate_script(self, job_name: str, script: Any, line: int):
+        """Validate script format"""
 
-        # Validate manual_confirmation
-        if 'manual_confirmation' in job:
-            self._validate_manual_confirmation(job_name, job['manual_confirmation'], line)
+        if not isinstance(script, (str, list)):
+            self._emit(
+                'error',
+                line,
+                f"Job '{job_name}': 'script' must be a string or list",
+                'job-script-invalid-type'
+            )
+        elif isinstance(script, list):
+            for i, cmd in enumerate(script):
+                if not isinstance(cmd, str):
+                    self._emit(
+                        'error',
+                        line,
+                        f"Job '{job_name}': script command #{i+1} must be a string",
+                        'job-script-item-invalid'
+                    )
 
     def _validate_artifacts(self, job_name: str, artifacts: Any, line: int):
         """Validate artifacts configuration"""
 
         if not isinstance(artifacts, dict):
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 line,
                 f"Job '{job_name}': 'artifacts' must be a dictionary",
                 'artifacts-not-dict'
-            ))
+            )
             return
 
-        valid_artifact_keywords = {
-            'paths', 'exclude', 'expire_in', 'expose_as', 'name',
-            'untracked', 'when', 'reports', 'public'
-        }
-
-        for keyword in artifacts.keys():
-            if keyword not in valid_artifact_keywords:
-                self.errors.append(ValidationError(
-                    'warning',
-                    line,
-                    f"Job '{job_name}': unknown artifacts keyword '{keyword}'",
-                    'artifacts-unknown-keyword'
-                ))
+        # Only walk the keys when at least one of them is unknown
+        if not self.ARTIFACT_KEYWORDS.issuperset(artifacts):
+            for keyword in artifacts:
+                if keyword not in self.ARTIFACT_KEYWORDS:
+                    self._emit(
+                        'warning',
+                        line,
+                        f"Job '{job_name}': unknown artifacts keyword '{keyword}'",
+                        'artifacts-unknown-keyword'
+                    )
 
         # Check for 'paths' (commonly required)
         if 'paths' not in artifacts and 'reports' not in artifacts:
-            self.errors.append(ValidationError(
+            self._emit(
                 'warning',
                 line,
                 f"Job '{job_name}': artifacts should have 'paths' or 'reports'",
                 'artifacts-no-paths'
-            ))
+            )
 
     def _validate_cache(self, job_name: str, cache: Any, line: int):
         """Validate cache configuration"""
 
         if not isinstance(cache, (dict, list)):
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 line,
                 f"Job '{job_name}': 'cache' must be a dictionary or list",
                 'cache-invalid-type'
-            ))
+            )
             return
 
-        caches = [cache] if isinstance(cache, dict) else cache
+        caches = (cache,) if isinstance(cache, dict) else cache
 
         for cache_item in caches:
             if not isinstance(cache_item, dict):
-                self.errors.append(ValidationError(
+                self._emit(
                     'error',
                     line,
                     f"Job '{job_name}': cache item must be a dictionary",
                     'cache-item-not-dict'
-                ))
+                )
                 continue
 
-            valid_cache_keywords = {
-                'paths', 'key', 'untracked', 'policy', 'when', 'fallback_keys'
-            }
-
-            for keyword in cache_item.keys():
-                if keyword not in valid_cache_keywords:
-                    self.errors.append(ValidationError(
-                        'warning',
-                        line,
-                        f"Job '{job_name}': unknown cache keyword '{keyword}'",
-                        'cache-unknown-keyword'
-                    ))
+            if not self.CACHE_KEYWORDS.issuperset(cache_item):
+                for keyword in cache_item:
+                    if keyword not in self.CACHE_KEYWORDS:
+                        self._emit(
+                            'warning',
+                            line,
+                            f"Job '{job_name}': unknown cache keyword '{keyword}'",
+                            'cache-unknown-keyword'
+                        )
 
             # Validate policy
             if 'policy' in cache_item:
                 policy = cache_item['policy']
-                valid_policies = {'pull', 'push', 'pull-push'}
-                if policy not in valid_policies:
-                    self.errors.append(ValidationError(
+                if policy not in self.CACHE_POLICIES:
+                    self._emit(
                         'error',
                         line,
                         f"Job '{job_name}': invalid cache policy '{policy}'. "
-                        f"Must be one of: {', '.join(sorted(valid_policies))}",
+                        f"Must be one of: {', '.join(sorted(self.CACHE_POLICIES))}",
                         'cache-invalid-policy'
-                    ))
+                    )
 
     def _validate_parallel(self, job_name: str, parallel: Any, line: int):
         """Validate parallel configuration"""
@@ -517,164 +747,157 @@ class GitLabCIValidator:
         # parallel can be an integer or a dict with matrix
         if isinstance(parallel, int):
             if parallel < 2 or parallel > 200:
-                self.errors.append(ValidationError(
+                self._emit(
                     'warning',
                     line,
                     f"Job '{job_name}': parallel value {parallel} should be between 2 and 200",
                     'parallel-invalid-range'
-                ))
+                )
         elif isinstance(parallel, dict):
             if 'matrix' in parallel:
                 matrix = parallel['matrix']
                 if not isinstance(matrix, list):
-                    self.errors.append(ValidationError(
+                    self._emit(
                         'error',
                         line,
                         f"Job '{job_name}': parallel:matrix must be a list",
                         'parallel-matrix-not-list'
-                    ))
+                    )
                 else:
                     # Validate matrix items
                     for i, matrix_item in enumerate(matrix):
                         if not isinstance(matrix_item, dict):
-                            self.errors.append(ValidationError(
+                            self._emit(
                                 'error',
                                 line,
                                 f"Job '{job_name}': parallel:matrix item #{i+1} must be a dictionary",
                                 'parallel-matrix-item-invalid'
-                            ))
+                            )
                             continue
 
                         # Each matrix item should have at least one variable with a list of values
                         for var_name, var_values in matrix_item.items():
                             if not isinstance(var_values, list):
-                                self.errors.append(ValidationError(
+                                self._emit(
                                     'error',
                                     line,
                                     f"Job '{job_name}': parallel:matrix variable '{var_name}' must have a list of values",
                                     'parallel-matrix-var-not-list'
-                                ))
+                                )
                             elif not var_values:
-                                self.errors.append(ValidationError(
+                                self._emit(
                                     'warning',
                                     line,
                                     f"Job '{job_name}': parallel:matrix variable '{var_name}' has empty values list",
                                     'parallel-matrix-var-empty'
-                                ))
+                                )
             else:
-                self.errors.append(ValidationError(
+                self._emit(
                     'error',
                     line,
                     f"Job '{job_name}': parallel must be an integer or have 'matrix' key",
                     'parallel-invalid-type'
-                ))
+                )
         else:
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 line,
                 f"Job '{job_name}': parallel must be an integer or dictionary",
                 'parallel-invalid-type'
-            ))
+            )
 
     def _validate_hooks(self, job_name: str, hooks: Any, line: int):
         """Validate hooks configuration"""
 
         if not isinstance(hooks, dict):
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 line,
                 f"Job '{job_name}': 'hooks' must be a dictionary",
                 'hooks-not-dict'
-            ))
+            )
             return
 
-        valid_hook_keywords = {'pre_get_sources_script'}
-
-        for keyword in hooks.keys():
-            if keyword not in valid_hook_keywords:
-                self.errors.append(ValidationError(
-                    'warning',
-                    line,
-                    f"Job '{job_name}': unknown hooks keyword '{keyword}'",
-                    'hooks-unknown-keyword'
-                ))
+        if not self.HOOK_KEYWORDS.issuperset(hooks):
+            for keyword in hooks:
+                if keyword not in self.HOOK_KEYWORDS:
+                    self._emit(
+                        'warning',
+                        line,
+                        f"Job '{job_name}': unknown hooks keyword '{keyword}'",
+                        'hooks-unknown-keyword'
+                    )
 
         # Validate pre_get_sources_script
         if 'pre_get_sources_script' in hooks:
             script = hooks['pre_get_sources_script']
             if not isinstance(script, (str, list)):
-                self.errors.append(ValidationError(
+                self._emit(
                     'error',
                     line,
                     f"Job '{job_name}': hooks:pre_get_sources_script must be a string or list",
                     'hooks-script-invalid-type'
-                ))
+                )
             elif isinstance(script, list):
                 for i, cmd in enumerate(script):
                     if not isinstance(cmd, str):
-                        self.errors.append(ValidationError(
+                        self._emit(
                             'error',
                             line,
                             f"Job '{job_name}': hooks:pre_get_sources_script command #{i+1} must be a string",
                             'hooks-script-item-invalid'
-                        ))
+                        )
 
-    def _validate_manual_confirmation(self, job_name: str, manual_confirmation: Any, line: int):
+    def _validate_manual_confirmation(self, job_name: str, manual_confirmation: Any, line: int,
+                                      job: Dict[str, Any]):
         """Validate manual_confirmation configuration"""
 
         if not isinstance(manual_confirmation, str):
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 line,
                 f"Job '{job_name}': 'manual_confirmation' must be a string",
                 'manual-confirmation-invalid-type'
-            ))
+            )
             return
 
         # Check if job has when: manual (required for manual_confirmation)
-        job = self.config.get(job_name, {})
         if job.get('when') != 'manual':
-            self.errors.append(ValidationError(
+            self._emit(
                 'warning',
                 line,
                 f"Job '{job_name}': 'manual_confirmation' requires 'when: manual'",
                 'manual-confirmation-no-manual-when'
-            ))
+            )
 
     def _validate_dependencies(self):
         """Validate job dependencies"""
 
-        # Collect all job names
-        all_jobs = {
-            key for key in self.config.keys()
-            if key not in self.GLOBAL_KEYWORDS and isinstance(self.config[key], dict)
-        }
-
-        for job_name, job in self.config.items():
-            if job_name in self.GLOBAL_KEYWORDS or not isinstance(job, dict):
-                continue
+        emit = self._emit
+        all_jobs = self._job_names
 
-            line = self._get_line(job_name)
+        for job_name, job in self._jobs:
+            line = self._job_line[job_name]
 
             # Validate 'dependencies'
             if 'dependencies' in job:
                 deps = job['dependencies']
                 if not isinstance(deps, list):
-                    self.errors.append(ValidationError(
+                    emit(
                         'error',
                         line,
                         f"Job '{job_name}': 'dependencies' must be a list",
                         'dependencies-not-list'
-                    ))
+                    )
                 else:
                     for dep in deps:
                         if dep not in all_jobs:
-                            self.errors.append(ValidationError(
+                            emit(
                                 'error',
                                 line,
                                 f"Job '{job_name}': references undefined job '{dep}' in dependencies",
                                 'dependencies-undefined-job'
-                            ))
+                            )
 
             # Validate 'needs'
             if 'needs' in job:
@@ -683,167 +906,136 @@ class GitLabCIValidator:
                     for need in needs:
                         if isinstance(need, str):
                             if need not in all_jobs:
-                                self.errors.append(ValidationError(
+                                emit(
                                     'error',
                                     line,
                                     f"Job '{job_name}': references undefined job '{need}' in needs",
                                     'needs-undefined-job'
-                                ))
+                                )
                         elif isinstance(need, dict):
                             if 'job' in need and need['job'] not in all_jobs:
-                                self.errors.append(ValidationError(
+                                emit(
                                     'error',
                                     line,
                                     f"Job '{job_name}': references undefined job '{need['job']}' in needs",
                                     'needs-undefined-job'
-                                ))
+                                )
                 elif not isinstance(needs, dict):
-                    self.errors.append(ValidationError(
+                    emit(
                         'error',
                         line,
                         f"Job '{job_name}': 'needs' must be a list or dictionary",
                         'needs-invalid-type'
-                    ))
+                    )
 
             # Validate 'extends'
             if 'extends' in job:
                 extends = job['extends']
-                extends_list = [extends] if isinstance(extends, str) else extends
+                extends_list = (extends,) if isinstance(extends, str) else extends
 
-                if isinstance(extends_list, list):
+                if isinstance(extends_list, (tuple, list)):
                     for ext in extends_list:
                         # Hidden jobs (templates) should start with '.'
                         if not ext.startswith('.') and ext not in all_jobs:
-                            self.errors.append(ValidationError(
+                            emit(
                                 'warning',
                                 line,
                                 f"Job '{job_name}': extends '{ext}' which is not defined. "
                                 "Template jobs should start with '.'",
                                 'extends-undefined'
-                            ))
+                            )
 
         # Check for circular dependencies in 'needs'
         self._check_circular_dependencies(all_jobs)
 
-    def _check_circular_dependencies(self, all_jobs: Set[str]):
+    def _check_circular_dependencies(self, all_jobs: FrozenSet[str]):
         """Check for circular dependencies in 'needs'"""
 
-        def get_job_needs(job_name: str) -> Set[str]:
-            """Get the set of jobs that this job needs"""
-            job = self.config.get(job_name, {})
-            needs = job.get('needs', [])
-
-            if isinstance(needs, dict):
-                return set()
-
-            if not isinstance(needs, list):
-                return set()
-
-            result = set()
-            for need in needs:
-                if isinstance(need, str):
-                    result.add(need)
-                elif isinstance(need, dict) and 'job' in need:
-                    result.add(need['job'])
-
-            return result
-
-        def has_cycle(job_name: str, visited: Set[str], path: Set[str]) -> List[str]:
-            """Check for cycles using DFS. Returns cycle path if found."""
-            if job_name in path:
-                # Found a cycle
-                return [job_name]
-
-            if job_name in visited:
-                return []
-
-            visited.add(job_name)
-            path.add(job_name)
-
-            for needed_job in get_job_needs(job_name):
-                if needed_job not in all_jobs:
-                    continue  # Skip undefined jobs (already reported)
-
-                cycle = has_cycle(needed_job, visited, path)
-                if cycle:
-                    cycle.append(job_name)
-                    return cycle
-
-            path.remove(job_name)
-            return []
-
-        visited = set()
-        for job_name in all_jobs:
-            if job_name not in visited:
-                cycle = has_cycle(job_name, visited, set())
-                if cycle:
-                    # Reverse to get correct order
-                    cycle.reverse()
-                    cycle_str = ' -> '.join(cycle)
-                    self.errors.append(ValidationError(
-                        'error',
-                        self._get_line(cycle[0]),
-                        f"Circular dependency detected: {cycle_str}",
-                        'circular-dependency'
-                    ))
-                    break  # Only report first cycle found
+        emit = self._emit
+
+        # Resolve 'needs' into an adjacency map once, skipping undefined jobs
+        # (already reported) and keeping declaration order for stable output
+        adjacency: Dict[str, Tuple[str, ...]] = {
+            job_name: tuple(dict.fromkeys(
+                need for need in self._extract_needs(job) if need in all_jobs
+            ))
+            for job_name, job in self._jobs
+        }
+
+        for cycle in _find_cycles([job_name for job_name, _ in self._jobs], adjacency):
+            cycle_str = ' -> '.join(cycle)
+            emit(
+                'error',
+                self._job_line[cycle[0]],
+                f"Circular dependency detected: {cycle_str}",
+                'circular-dependency'
+            )
+
+    def _extract_needs(self, job: Dict[str, Any]) -> Tuple[str, ...]:
+        """Return the job names referenced by a job's 'needs' list"""
+
+        needs = job.get('needs')
+        if not isinstance(needs, list):
+            return ()
+
+        names = []
+        for need in needs:
+            if isinstance(need, dict):
+                need = need.get('job')
+            if isinstance(need, str):
+                names.append(need)
+        return tuple(names)
 
     def _validate_rules(self):
         """Validate rules and conditions"""
 
-        for job_name, job in self.config.items():
-            if job_name in self.GLOBAL_KEYWORDS or not isinstance(job, dict):
-                continue
+        emit = self._emit
 
+        for job_name, job in self._jobs:
             if 'rules' not in job:
                 continue
 
-            line = self._get_line(job_name)
+            line = self._job_line[job_name]
             rules = job['rules']
 
             if not isinstance(rules, list):
-                self.errors.append(ValidationError(
+                emit(
                     'error',
                     line,
                     f"Job '{job_name}': 'rules' must be a list",
                     'rules-not-list'
-                ))
+                )
                 continue
 
             for i, rule in enumerate(rules):
                 if not isinstance(rule, dict):
-                    self.errors.append(ValidationError(
+                    emit(
                         'error',
                         line,
                         f"Job '{job_name}': rule #{i+1} must be a dictionary",
                         'rule-not-dict'
-                    ))
+                    )
                     continue
 
-                valid_rule_keywords = {
-                    'if', 'changes', 'exists', 'when', 'allow_failure',
-                    'variables', 'needs', 'start_in'
-                }
-
                 for keyword in rule.keys():
-                    if keyword not in valid_rule_keywords:
-                        self.errors.append(ValidationError(
+                    if keyword not in self.VALID_RULE_KEYWORDS:
+                        emit(
                             'warning',
                             line,
                             f"Job '{job_name}': unknown rule keyword '{keyword}'",
                             'rule-unknown-keyword'
-                        ))
+                        )
 
                 # Validate 'when' in rules
                 if 'when' in rule:
                     when = rule['when']
                     if when not in self.VALID_WHEN_VALUES:
-                        self.errors.append(ValidationError(
+                        emit(
                             'error',
                             line,
                             f"Job '{job_name}': invalid 'when' value in rule: '{when}'",
                             'rule-when-invalid'
-                        ))
+                        )
 
     def _validate_gitlab_limits(self):
         """Validate GitLab CI/CD limits and constraints"""
@@ -853,42 +1045,37 @@ class GitLabCIValidator:
         MAX_JOB_NAME_LENGTH = 255  # Maximum job name length
         MAX_NEEDS = 50  # Maximum needs dependencies per job
 
-        # Count all jobs (excluding global keywords and hidden templates)
-        all_jobs = {
-            key: value for key, value in self.config.items()
-            if key not in self.GLOBAL_KEYWORDS and isinstance(value, dict)
-        }
-
-        job_count = len(all_jobs)
+        # Count all jobs (excluding global keywords)
+        job_count = len(self._jobs)
 
         # Check total job count
         if job_count > MAX_JOBS:
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 1,
                 f"Total job count ({job_count}) exceeds GitLab limit of {MAX_JOBS} jobs per pipeline",
                 'gitlab-limit-max-jobs'
-            ))
+            )
         elif job_count > MAX_JOBS * 0.8:  # Warn at 80%
-            self.errors.append(ValidationError(
+            self._emit(
                 'warning',
                 1,
                 f"Total job count ({job_count}) is approaching GitLab limit of {MAX_JOBS} jobs (>80%)",
                 'gitlab-limit-max-jobs-warning'
-            ))
+            )
 
         # Check individual job constraints
-        for job_name, job in all_jobs.items():
-            line = self._get_line(job_name)
+        for job_name, job in self._jobs:
+            line = self._job_line[job_name]
 
             # Check job name length
             if len(job_name) > MAX_JOB_NAME_LENGTH:
-                self.errors.append(ValidationError(
+                self._emit(
                     'error',
                     line,
                     f"Job name '{job_name}' exceeds maximum length of {MAX_JOB_NAME_LENGTH} characters (current: {len(job_name)})",
                     'gitlab-limit-job-name-length'
-                ))
+                )
 
             # Check needs dependencies count
             if 'needs' in job:
@@ -905,123 +1092,71 @@ class GitLabCIValidator:
                         needs_count = 1
 
                 if needs_count > MAX_NEEDS:
-                    self.errors.append(ValidationError(
+                    self._emit(
                         'error',
                         line,
                         f"Job '{job_name}' has {needs_count} needs dependencies, exceeding GitLab limit of {MAX_NEEDS}",
                         'gitlab-limit-max-needs'
-                    ))
+                    )
 
     def _validate_extends_relationships(self):
         """Validate extends relationships for circular references and depth"""
 
         MAX_EXTENDS_DEPTH = 11  # GitLab limit for extends chain depth
 
-        # Collect all jobs and templates
-        all_jobs = {
-            key: value for key, value in self.config.items()
-            if isinstance(value, dict)
-        }
-
-        def get_extends_list(job_name: str) -> List[str]:
-            """Get the list of templates/jobs this job extends"""
-            job = self.config.get(job_name, {})
-            extends = job.get('extends', [])
-
-            if isinstance(extends, str):
-                return [extends]
-            elif isinstance(extends, list):
-                return extends
-            return []
-
-        def check_circular_extends(job_name: str, visited: Set[str], path: Set[str]) -> List[str]:
-            """Check for circular extends using DFS. Returns cycle path if found."""
-            if job_name in path:
-                # Found a cycle
-                return [job_name]
-
-            if job_name in visited:
-                return []
-
-            visited.add(job_name)
-            path.add(job_name)
-
-            for extended_job in get_extends_list(job_name):
-                if extended_job not in all_jobs:
-                    continue  # Skip undefined templates (already reported)
-
-                cycle = check_circular_extends(extended_job, visited, path)
-                if cycle:
-                    cycle.append(job_name)
-                    return cycle
-
-            path.remove(job_name)
-            return []
-
-        def get_extends_depth(job_name: str, visited: Set[str] = None) -> int:
-            """Calculate the extends chain depth for a job"""
-            if visited is None:
-                visited = set()
+        all_jobs = self._all_entries
 
-            if job_name in visited:
-                # Circular reference (already reported)
-                return 0
-
-            visited.add(job_name)
-
-            extends_list = get_extends_list(job_name)
-            if not extends_list:
-                return 0
-
-            max_depth = 0
-            for extended_job in extends_list:
-                if extended_job in all_jobs:
-                    depth = get_extends_depth(extended_job, visited.copy())
-                    max_depth = max(max_depth, depth)
-
-            return max_depth + 1
+        # Resolve every job's extends list once; both checks below share it
+        extends_map = {
+            job_name: self._extract_extends(job) for job_name, job in all_jobs.items()
+        }
+        job_order = list(all_jobs)
 
         # Check for circular extends
-        visited = set()
-        for job_name in all_jobs.keys():
-            if job_name not in visited:
-                cycle = check_circular_extends(job_name, visited, set())
-                if cycle:
-                    # Reverse to get correct order
-                    cycle.reverse()
-                    cycle_str = ' -> '.join(cycle)
-                    line = self._get_line(cycle[0])
-                    self.errors.append(ValidationError(
-                        'error',
-                        line,
-                        f"Circular extends detected: {cycle_str}",
-                        'circular-extends'
-                    ))
-                    break  # Only report first cycle found
+        for cycle in _find_extends_cycles(job_order, extends_map):
+            cycle_str = ' -> '.join(cycle)
+            line = self._job_line[cycle[0]]
+            self._emit(
+                'error',
+                line,
+                f"Circular extends detected: {cycle_str}",
+                'circular-extends'
+            )
 
-        # Check extends depth
-        for job_name in all_jobs.keys():
+        # Check extends depth; jobs caught in a cycle (reported above) have none
+        depths = _extends_depths(job_order, extends_map)
+        for job_name in job_order:
             # Skip hidden templates (they're meant to be extended)
-            if job_name.startswith('.'):
+            if job_name.startswith('.') or job_name not in depths:
                 continue
 
-            depth = get_extends_depth(job_name)
+            depth = depths[job_name]
             if depth > MAX_EXTENDS_DEPTH:
-                line = self._get_line(job_name)
-                self.errors.append(ValidationError(
+                line = self._job_line[job_name]
+                self._emit(
                     'error',
                     line,
                     f"Job '{job_name}' has extends chain depth of {depth}, exceeding GitLab limit of {MAX_EXTENDS_DEPTH}",
                     'gitlab-limit-extends-depth'
-                ))
+                )
             elif depth > MAX_EXTENDS_DEPTH * 0.8:  # Warn at 80%
-                line = self._get_line(job_name)
-                self.errors.append(ValidationError(
+                line = self._job_line[job_name]
+                self._emit(
                     'warning',
                     line,
                     f"Job '{job_name}' has extends chain depth of {depth}, approaching GitLab limit of {MAX_EXTENDS_DEPTH} (>80%)",
                     'gitlab-limit-extends-depth-warning'
-                ))
+                )
+
+    def _extract_extends(self, job: Dict[str, Any]) -> Sequence[str]:
+        """Return the templates/jobs a job extends"""
+
+        extends = job.get('extends')
+        if isinstance(extends, str):
+            return (extends,)
+        if isinstance(extends, list):
+            return extends
+        return ()
 
     def _validate_includes(self):
         """Validate include configurations including components, project, local, remote, and template"""
@@ -1040,100 +1175,88 @@ class GitLabCIValidator:
         MAX_COMPONENTS_PER_PROJECT = 100
         component_count = 0
 
-        for i, inc in enumerate(includes):
-            if inc is None:
-                self.errors.append(ValidationError(
-                    'error',
-                    line,
-                    f"Include item #{i+1} is null",
-                    'include-null-item'
-                ))
-                continue
-
-            # Include can be a string (shorthand for local file) or dict
-            if isinstance(inc, str):
-                # Shorthand for local file
-                self._validate_local_include(inc, line, i+1)
-                continue
-
-            if not isinstance(inc, dict):
-                self.errors.append(ValidationError(
-                    'error',
-                    line,
-                    f"Include item #{i+1} must be a string or dictionary, got {type(inc).__name__}",
-                    'include-invalid-type'
-                ))
-                continue
-
-            # Determine include type
-            include_types = []
-            if 'component' in inc:
-                include_types.append('component')
-            if 'local' in inc:
-                include_types.append('local')
-            if 'remote' in inc:
-                include_types.append('remote')
-            if 'template' in inc:
-                include_types.append('template')
-            if 'project' in inc:
-                include_types.append('project')
-            if 'file' in inc and 'project' not in inc:
-                # 'file' alone is invalid, must be with 'project'
-                self.errors.append(ValidationError(
-                    'error',
-                    line,
-                    f"Include item #{i+1}: 'file' must be used with 'project'",
-                    'include-file-without-project'
-                ))
-
-            # Check that exactly one include type is specified
-            if len(include_types) == 0:
-                self.errors.append(ValidationError(
-                    'error',
-                    line,
-                    f"Include item #{i+1}: must specify one of: component, local, remote, template, or project",
-                    'include-no-type'
-                ))
-                continue
-            elif len(include_types) > 1:
-                self.errors.append(ValidationError(
-                    'error',
-                    line,
-                    f"Include item #{i+1}: cannot specify multiple include types: {', '.join(include_types)}",
-                    'include-multiple-types'
-                ))
-                continue
-
-            # Validate based on type
-            include_type = include_types[0]
-
-            if include_type == 'component':
+        # Items are validated independently, in order
+        for item_num, inc in enumerate(includes, 1):
+            if self._validate_include_item(inc, line, item_num) == 'component':
                 component_count += 1
-                self._validate_component_include(inc, line, i+1)
-            elif include_type == 'local':
-                self._validate_local_include(inc['local'], line, i+1)
-            elif include_type == 'remote':
-                self._validate_remote_include(inc, line, i+1)
-            elif include_type == 'template':
-                self._validate_template_include(inc, line, i+1)
-            elif include_type == 'project':
-                self._validate_project_include(inc, line, i+1)
 
         # Check component count limit
         if component_count > MAX_COMPONENTS_PER_PROJECT:
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 line,
                 f"Total component count ({component_count}) exceeds GitLab limit of {MAX_COMPONENTS_PER_PROJECT} components per project",
                 'include-component-limit-exceeded'
-            ))
+            )
         elif component_count > MAX_COMPONENTS_PER_PROJECT * 0.8:  # Warn at 80%
-            self.errors.append(ValidationError(
+            self._emit(
                 'warning',
                 line,
                 f"Total component count ({component_count}) is approaching GitLab limit of {MAX_COMPONENTS_PER_PROJECT} components (>80%)",
                 'include-component-limit-warning'
-            ))
+            )
+
+    def _validate_include_item(self, inc: Any, line: int, item_num: int) -> Optional[str]:
+        """Validate one include item; return its include type if it has exactly one"""
+
+        if inc is None:
+            self._emit(
+                'error',
+                line,
+                f"Include item #{item_num} is null",
+                'include-null-item'
+            )
+            return None
+
+        # Include can be a string (shorthand for local file) or dict
+        if isinstance(inc, str):
+            # Shorthand for local file
+            self._validate_local_include(inc, line, item_num)
+            return 'local'
+
+        if not isinstance(inc, dict):
+            self._emit(
+                'error',
+                line,
+                f"Include item #{item_num} must be a string or dictionary, got {type(inc).__name__}",
+                'include-invalid-type'
+            )
+            return None
+
+        # Determine include type
+        include_types = self._INCLUDE_TYPE_KEYS & inc.keys()
+        if 'file' in inc and 'project' not in inc:
+            # 'file' alone is invalid, must be with 'project'
+            self._emit(
+                'error',
+                line,
+                f"Include item #{item_num}: 'file' must be used with 'project'",
+                'include-file-without-project'
+            )
+
+        # Check that exactly one include type is specified
+        if len(include_types) == 0:
+            self._emit(
+                'error',
+                line,
+                f"Include item #{item_num}: must specify one of: component, local, remote, template, or project",
+                'include-no-type'
+            )
+            return None
+        elif len(include_types) > 1:
+            listed = [t for t in self.INCLUDE_TYPES if t in include_types]
+            self._emit(
+                'error',
+                line,
+                f"Include item #{item_num}: cannot specify multiple include types: {', '.join(listed)}",
+                'include-multiple-types'
+            )
+            return None
+
+        # Validate based on type
+        include_type, = include_types
+        self._include_handlers[include_type](inc, line, item_num)
+        return include_type
 
     def _validate_component_include(self, inc: Dict[str, Any], line: int, item_num: int):
         """Validate include:component syntax (GitLab 16.x+)"""
@@ -1141,12 +1264,12 @@ class GitLabCIValidator:
         component = inc.get('component')
 
         if not isinstance(component, str):
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 line,
                 f"Include item #{item_num}: 'component' must be a string",
                 'include-component-invalid-type'
-            ))
+            )
             return
 
         # Component format: <fqdn>/<path>@<version>
@@ -1157,23 +1280,23 @@ class GitLabCIValidator:
 
         # Check for @ separator (version is required)
         if '@' not in component:
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 line,
                 f"Include item #{item_num}: component '{component}' must specify a version with '@version'",
                 'include-component-no-version'
-            ))
+            )
             return
 
         # Split into path and version
         component_parts = component.rsplit('@', 1)
         if len(component_parts) != 2:
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 line,
                 f"Include item #{item_num}: invalid component format '{component}'. Expected: <fqdn>/<path>@<version>",
                 'include-component-invalid-format'
-            ))
+            )
             return
 
         component_path, version = component_parts
@@ -1183,112 +1306,108 @@ class GitLabCIValidator:
         # Can be variable like $CI_SERVER_FQDN or literal domain
         if component_path.startswith('$'):
             # Variable reference - check it's a valid variable name
-            var_match = re.match(r'^\$\{?[A-Z_][A-Z0-9_]*\}?', component_path)
+            var_match = self._VAR_REF_RE.match(component_path)
             if not var_match:
-                self.errors.append(ValidationError(
+                self._emit(
                     'error',
                     line,
                     f"Include item #{item_num}: invalid variable in component path '{component_path}'",
                     'include-component-invalid-variable'
-                ))
+                )
                 return
             # Extract the rest after variable
             remaining_path = component_path[var_match.end():]
             if not remaining_path.startswith('/'):
-                self.errors.append(ValidationError(
+                self._emit(
                     'error',
                     line,
                     f"Include item #{item_num}: component path must have '/' after variable: '{component_path}'",
                     'include-component-missing-slash'
-                ))
+                )
         else:
             # Literal domain/path
             # Should match: domain.com/org/project or similar
             if '/' not in component_path:
-                self.errors.append(ValidationError(
+                self._emit(
                     'error',
                     line,
                     f"Include item #{item_num}: component path must include organization and project: '{component_path}'",
                     'include-component-incomplete-path'
-                ))
+                )
 
         # Validate version format
         # Can be: 1.0.0, ~latest, ~1.0, 1, etc.
-        if version == '~latest':
-            # Valid: ~latest for absolute latest version
-            pass
-        elif version.startswith('~'):
-            # Partial semantic version like ~1.0 (matches latest 1.0.x)
-            version_pattern = version[1:]  # Remove ~
-            # Should be numeric with optional dots
-            if not re.match(r'^\d+(\.\d+)*$', version_pattern):
-                self.errors.append(ValidationError(
+        if not self._COMPONENT_VERSION_RE.match(version):
+            if version.startswith('~'):
+                # Partial semantic version like ~1.0 (matches latest 1.0.x)
+                self._emit(
                     'error',
                     line,
                     f"Include item #{item_num}: invalid version pattern '{version}'. Expected: ~latest, ~1.0, or semantic version",
                     'include-component-invalid-version-pattern'
-                ))
-        else:
-            # Semantic version: 1.0.0, 1.0, or 1
-            if not re.match(r'^\d+(\.\d+){0,2}$', version):
-                self.errors.append(ValidationError(
+                )
+            else:
+                # Semantic version: 1.0.0, 1.0, or 1
+                self._emit(
                     'error',
                     line,
                     f"Include item #{item_num}: invalid semantic version '{version}'. Expected: X.Y.Z, X.Y, or X",
                     'include-component-invalid-semver'
-                ))
+                )
 
         # Validate inputs if present
         if 'inputs' in inc:
             inputs = inc['inputs']
             if not isinstance(inputs, dict):
-                self.errors.append(ValidationError(
+                self._emit(
                     'error',
                     line,
                     f"Include item #{item_num}: 'inputs' must be a dictionary",
                     'include-component-inputs-invalid-type'
-                ))
+                )
 
         # Check for invalid keywords with component
-        valid_component_keywords = {'component', 'inputs', 'rules'}
         for keyword in inc.keys():
-            if keyword not in valid_component_keywords:
-                self.errors.append(ValidationError(
+            if keyword not in self.COMPONENT_INCLUDE_KEYWORDS:
+                self._emit(
                     'warning',
                     line,
-                    f"Include item #{item_num}: unknown keyword '{keyword}' for component include",
-                    'include-component-unknown-keyword'
-                ))
+                    "Include item #%s: unknown keyword '%s' for component include",
+                    'include-component-unknown-keyword',
+                    (item_num, keyword)
+                )
 
     def _validate_local_include(self, local_path: Any, line: int, item_num: int):
         """Validate include:local syntax"""
 
         if not isinstance(local_path, str):
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 line,
                 f"Include item #{item_num}: 'local' must be a string",
                 'include-local-invalid-type'
-            ))
+            )
             return
 
         # Local path should start with / for absolute or ./ for relative
-        if not local_path.startswith(('/','.')):
-            self.errors.append(ValidationError(
+        if not local_path.startswith(self._LOCAL_PATH_PREFIXES):
+            self._emit(
                 'warning',
                 line,
-                f"Include item #{item_num}: local path '{local_path}' should start with '/' or './'",
-                'include-local-path-format'
-            ))
+                "Include item #%s: local path '%s' should start with '/' or './'",
+                'include-local-path-format',
+                (item_num, local_path)
+            )
 
         # Should end with .yml or .yaml
-        if not local_path.endswith(('.yml', '.yaml')):
-            self.errors.append(ValidationError(
+        if not local_path.endswith(self._YAML_EXTS):
+            self._emit(
                 'warning',
                 line,
-                f"Include item #{item_num}: local path '{local_path}' should end with .yml or .yaml",
-                'include-local-file-extension'
-            ))
+                "Include item #%s: local path '%s' should end with .yml or .yaml",
+                'include-local-file-extension',
+                (item_num, local_path)
+            )
 
     def _validate_remote_include(self, inc: Dict[str, Any], line: int, item_num: int):
         """Validate include:remote syntax"""
@@ -1296,33 +1415,33 @@ class GitLabCIValidator:
         remote = inc.get('remote')
 
         if not isinstance(remote, str):
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 line,
                 f"Include item #{item_num}: 'remote' must be a string URL",
                 'include-remote-invalid-type'
-            ))
+            )
             return
 
         # Should be a valid URL
-        if not remote.startswith(('http://', 'https://')):
-            self.errors.append(ValidationError(
+        if not remote.startswith(self._HTTP_SCHEMES):
+            self._emit(
                 'error',
                 line,
                 f"Include item #{item_num}: remote URL must start with http:// or https://",
                 'include-remote-invalid-url'
-            ))
+            )
 
         # Check for valid keywords with remote
-        valid_remote_keywords = {'remote', 'rules'}
         for keyword in inc.keys():
-            if keyword not in valid_remote_keywords:
-                self.errors.append(ValidationError(
+            if keyword not in self.REMOTE_INCLUDE_KEYWORDS:
+                self._emit(
                     'warning',
                     line,
-                    f"Include item #{item_num}: unknown keyword '{keyword}' for remote include",
-                    'include-remote-unknown-keyword'
-                ))
+                    "Include item #%s: unknown keyword '%s' for remote include",
+                    'include-remote-unknown-keyword',
+                    (item_num, keyword)
+                )
 
     def _validate_template_include(self, inc: Dict[str, Any], line: int, item_num: int):
         """Validate include:template syntax"""
@@ -1330,37 +1449,38 @@ class GitLabCIValidator:
         template = inc.get('template')
 
         if not isinstance(template, str):
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 line,
                 f"Include item #{item_num}: 'template' must be a string",
                 'include-template-invalid-type'
-            ))
+            )
             return
 
         # Template should end with .yml or .yaml
-        if not template.endswith(('.yml', '.yaml', '.gitlab-ci.yml')):
-            self.errors.append(ValidationError(
+        if not template.endswith(self._YAML_EXTS):
+            self._emit(
                 'warning',
                 line,
-                f"Include item #{item_num}: template '{template}' should end with .yml or .yaml",
-                'include-template-file-extension'
-            ))
+                "Include item #%s: template '%s' should end with .yml or .yaml",
+                'include-template-file-extension',
+                (item_num, template)
+            )
 
         # Common GitLab templates: Auto-DevOps.gitlab-ci.yml, Jobs/*.gitlab-ci.yml, Security/*.gitlab-ci.yml
         # These are in /lib/gitlab/ci/templates/
         # Just validate the format, don't check if template exists (that requires API access)
 
         # Check for valid keywords with template
-        valid_template_keywords = {'template', 'rules'}
         for keyword in inc.keys():
-            if keyword not in valid_template_keywords:
-                self.errors.append(ValidationError(
+            if keyword not in self.TEMPLATE_INCLUDE_KEYWORDS:
+                self._emit(
                     'warning',
                     line,
-                    f"Include item #{item_num}: unknown keyword '{keyword}' for template include",
-                    'include-template-unknown-keyword'
-                ))
+                    "Include item #%s: unknown keyword '%s' for template include",
+                    'include-template-unknown-keyword',
+                    (item_num, keyword)
+                )
 
     def _validate_project_include(self, inc: Dict[str, Any], line: int, item_num: int):
         """Validate include:project syntax"""
@@ -1368,31 +1488,32 @@ class GitLabCIValidator:
         project = inc.get('project')
 
         if not isinstance(project, str):
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 line,
                 f"Include item #{item_num}: 'project' must be a string",
                 'include-project-invalid-type'
-            ))
+            )
             return
 
         # Project format should be: group/project or group/subgroup/project
         if '/' not in project:
-            self.errors.append(ValidationError(
+            self._emit(
                 'warning',
                 line,
-                f"Include item #{item_num}: project '{project}' should include group/project format",
-                'include-project-format'
-            ))
+                "Include item #%s: project '%s' should include group/project format",
+                'include-project-format',
+                (item_num, project)
+            )
 
         # 'file' is required with 'project'
         if 'file' not in inc:
-            self.errors.append(ValidationError(
+            self._emit(
                 'error',
                 line,
                 f"Include item #{item_num}: 'file' is required when using 'project'",
                 'include-project-missing-file'
-            ))
+            )
         else:
             file_val = inc['file']
             # file can be a string or list of strings
@@ -1401,81 +1522,112 @@ class GitLabCIValidator:
             elif isinstance(file_val, list):
                 files = file_val
             else:
-                self.errors.append(ValidationError(
+                self._emit(
                     'error',
                     line,
                     f"Include item #{item_num}: 'file' must be a string or list of strings",
                     'include-project-file-invalid-type'
-                ))
+                )
                 files = []
 
             # Validate each file path
             for file_path in files:
                 if not isinstance(file_path, str):
-                    self.errors.append(ValidationError(
+                    self._emit(
                         'error',
                         line,
                         f"Include item #{item_num}: file path must be a string",
                         'include-project-file-item-invalid'
-                    ))
+                    )
                     continue
 
                 # File should start with / or ./
-                if not file_path.startswith(('/', './')):
-                    self.errors.append(ValidationError(
+                if not file_path.startswith(self._PROJECT_FILE_PREFIXES):
+                    self._emit(
                         'warning',
                         line,
-                        f"Include item #{item_num}: file path '{file_path}' should start with '/' or './'",
-                        'include-project-file-path-format'
-                    ))
+                        "Include item #%s: file path '%s' should start with '/' or './'",
+                        'include-project-file-path-format',
+                        (item_num, file_path)
+                    )
 
                 # Should end with .yml or .yaml
-                if not file_path.endswith(('.yml', '.yaml')):
-                    self.errors.append(ValidationError(
+                if not file_path.endswith(self._YAML_EXTS):
+                    self._emit(
                         'warning',
                         line,
-                        f"Include item #{item_num}: file path '{file_path}' should end with .yml or .yaml",
-                        'include-project-file-extension'
-                    ))
+                        "Include item #%s: file path '%s' should end with .yml or .yaml",
+                        'include-project-file-extension',
+                        (item_num, file_path)
+                    )
 
         # 'ref' is recommended for reproducibility (commit SHA, tag, or branch)
         if 'ref' not in inc:
-            self.errors.append(ValidationError(
+            self._emit(
                 'warning',
                 line,
-                f"Include item #{item_num}: consider specifying 'ref' (commit SHA, tag, or branch) for reproducibility",
-                'include-project-no-ref'
-            ))
+                "Include item #%s: consider specifying 'ref' (commit SHA, tag, or branch) for reproducibility",
+                'include-project-no-ref',
+                (item_num,)
+            )
 
         # Check for valid keywords with project
-        valid_project_keywords = {'project', 'file', 'ref', 'rules'}
         for keyword in inc.keys():
-            if keyword not in valid_project_keywords:
-                self.errors.append(ValidationError(
+            if keyword not in self.PROJECT_INCLUDE_KEYWORDS:
+                self._emit(
                     'warning',
                     line,
-                    f"Include item #{item_num}: unknown keyword '{keyword}' for project include",
-                    'include-project-unknown-keyword'
-                ))
+                    "Include item #%s: unknown keyword '%s' for project include",
+                    'include-project-unknown-keyword',
+                    (item_num, keyword)
+                )
 
 
 def main():
     """Main entry point"""
 
-    if len(sys.argv) < 2:
-        print("Usage: validate_syntax.py <gitlab-ci.yml> [--json]", file=sys.stderr)
+    usage = "Usage: validate_syntax.py <gitlab-ci.yml> [--json] [--min-severity info|warning|error]"
+
+    args = sys.argv[1:]
+    json_output = '--json' in args
+    min_severity = 'info'
+    file_paths: List[str] = []
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '--min-severity':
+            if i + 1 >= len(args) or args[i + 1] not in GitLabCIValidator.SEVERITY_RANK:
+                print("Error: --min-severity must be one of: info, warning, error", file=sys.stderr)
+                sys.exit(1)
+            min_severity = args[i + 1]
+            i += 2
+            continue
+        if arg != '--json':
+            file_paths.append(arg)
+        i += 1
+
+    if not file_paths:
+        print(usage, file=sys.stderr)
         sys.exit(1)
 
-    file_path = sys.argv[1]
-    json_output = '--json' in sys.argv
+    file_path = file_paths[0]
 
-    validator = GitLabCIValidator(file_path)
+    validator = GitLabCIValidator(file_path, min_severity)
     success, errors = validator.validate()
 
-    # Group by severity
-    by_severity = defaultdict(list)
+    # Group by severity in one pass
+    error_list: List[ValidationError] = []
+    warning_list: List[ValidationError] = []
+    info_list: List[ValidationError] = []
     for error in errors:
-        by_severity[error.severity].append(error)
+        severity = error.severity
+        if severity == 'error':
+            error_list.append(error)
+        elif severity == 'warning':
+            warning_list.append(error)
+        else:
+            info_list.append(error)
 
     if json_output:
         # Output JSON format
@@ -1485,12 +1637,17 @@ def main():
             'success': success,
             'issues': [error.to_dict() for error in errors],
             'summary': {
-                'errors': len(by_severity.get('error', [])),
-                'warnings': len(by_severity.get('warning', [])),
-                'info': len(by_severity.get('info', []))
+                'errors': len(error_list),
+                'warnings': len(warning_list),
+                'info': len(info_list)
             }
         }
-        print(json.dumps(result, indent=2))
+        # Pretty-print for people; emit compact JSON when piped to a tool
+        if sys.stdout.isatty():
+            json.dump(result, sys.stdout, indent=2)
+        else:
+            json.dump(result, sys.stdout, separators=(',', ':'))
+        sys.stdout.write('\n')
     else:
         # Output formatted text
         if errors:
@@ -1499,17 +1656,17 @@ def main():
             print(f"{'='*80}\n")
 
             # Print errors first, then warnings, then info
-            for severity in ['error', 'warning', 'info']:
-                if severity in by_severity:
-                    print(f"\n{severity.upper()}S ({len(by_severity[severity])}):")
+            for severity, group in (('error', error_list), ('warning', warning_list), ('info', info_list)):
+                if group:
+                    print(f"\n{severity.upper()}S ({len(group)}):")
                     print("-" * 80)
-                    for error in by_severity[severity]:
+                    for error in group:
                         print(f"  {error}")
 
             print(f"\n{'='*80}")
-            print(f"Summary: {len(by_severity['error'])} errors, "
-                  f"{len(by_severity.get('warning', []))} warnings, "
-                  f"{len(by_severity.get('info', []))} info")
+            print(f"Summary: {len(error_list)} errors, "
+                  f"{len(warning_list)} warnings, "
+                  f"{len(info_list)} info")
             print(f"{'='*80}\n")
 
         if success:
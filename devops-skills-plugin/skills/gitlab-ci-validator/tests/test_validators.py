@@ -7,6 +7,11 @@ Each test class focuses on one bug or gap fix:
   - TestGap1ImageNoTag    : images without a version tag are detected
   - TestGap2EchoSecrets   : prefixed / brace-wrapped secret variables are detected
   - TestGap3ArtifactPaths : security-report filenames not false-flagged as sensitive
+  - TestSecurityBatchScan : multiple files scanned in one check_security.py run
+  - TestNeedsCycles       : every independent 'needs' cycle is reported
+  - TestDuplicateStages   : each repeated stage name is reported once
+  - TestExtendsGraph      : deep chains handled, every 'extends' cycle reported
+  - TestMinSeverity       : --min-severity drops lower-severity findings
 """
 
 import json
@@ -28,7 +33,7 @@ SECURITY_CHECKER = SKILL_DIR / "scripts" / "check_security.py"
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _run_syntax(yaml_text: str) -> tuple[subprocess.CompletedProcess, dict]:
+def _run_syntax(yaml_text: str, *extra_args: str) -> tuple[subprocess.CompletedProcess, dict]:
     """Write yaml_text to a temp file and run validate_syntax.py --json."""
     with tempfile.NamedTemporaryFile(
         mode="w", suffix=".yml", delete=False
@@ -37,7 +42,7 @@ def _run_syntax(yaml_text: str) -> tuple[subprocess.CompletedProcess, dict]:
         path = f.name
     try:
         proc = subprocess.run(
-            [sys.executable, str(SYNTAX_VALIDATOR), path, "--json"],
+            [sys.executable, str(SYNTAX_VALIDATOR), path, "--json", *extra_args],
             capture_output=True,
             text=True,
             check=False,
@@ -674,5 +679,219 @@ class TestBug4DockerBuildTemplate(unittest.TestCase):
         )
 
 
+# ---------------------------------------------------------------------------
+# Security scanner batch mode — several files in one invocation
+# ---------------------------------------------------------------------------
+
+class TestSecurityBatchScan(unittest.TestCase):
+    """check_security.py accepts multiple files and reports each in order."""
+
+    _CLEAN = """
+        build:
+          image: node:20
+          script:
+            - npm ci
+    """
+
+    _RISKY = """
+        deploy:
+          image: alpine:3.18
+          script:
+            - curl https://example.com/install.sh | bash
+    """
+
+    def _write(self, yaml_text: str) -> str:
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".yml", delete=False
+        ) as f:
+            f.write(textwrap.dedent(yaml_text).strip() + "\n")
+        self.addCleanup(Path(f.name).unlink, missing_ok=True)
+        return f.name
+
+    def test_batch_json_lists_results_in_input_order(self):
+        """--json over several files emits one result per file, in argv order."""
+        clean, risky = self._write(self._CLEAN), self._write(self._RISKY)
+        proc = subprocess.run(
+            [sys.executable, str(SECURITY_CHECKER), clean, risky, "--json", "--jobs", "2"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        results = json.loads(proc.stdout)
+        self.assertEqual([r["file"] for r in results], [clean, risky])
+        self.assertTrue(results[0]["success"])
+        self.assertFalse(results[1]["success"])
+        self.assertIn("curl-pipe-bash", _issue_rules(results[1]))
+        self.assertEqual(proc.returncode, 1, "Any high-severity file must fail the batch")
+
+    def test_batch_of_clean_files_passes(self):
+        """A batch with only clean files exits 0."""
+        paths = [self._write(self._CLEAN), self._write(self._CLEAN)]
+        proc = subprocess.run(
+            [sys.executable, str(SECURITY_CHECKER), *paths],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertEqual(proc.stdout.count("No security issues found"), 2)
+
+
+# ---------------------------------------------------------------------------
+# 'needs' cycles — all independent cycles are reported, in file order
+# ---------------------------------------------------------------------------
+
+class TestNeedsCycles(unittest.TestCase):
+    """Circular 'needs' detection must report each cycle, not just the first."""
+
+    def test_each_independent_cycle_is_reported(self):
+        """Two disjoint cycles produce two circular-dependency errors."""
+        _, result = _run_syntax("""
+            a:
+              script: echo a
+              needs: [b]
+            b:
+              script: echo b
+              needs: [a]
+            c:
+              script: echo c
+              needs: [{job: d}]
+            d:
+              script: echo d
+              needs: [c]
+        """)
+        cycles = [
+            issue["message"] for issue in result.get("issues", [])
+            if issue["rule"] == "circular-dependency"
+        ]
+        self.assertEqual(
+            cycles,
+            [
+                "Circular dependency detected: a -> b -> a",
+                "Circular dependency detected: c -> d -> c",
+            ],
+        )
+
+    def test_acyclic_needs_not_flagged(self):
+        """A diamond-shaped needs graph is not a cycle."""
+        _, result = _run_syntax("""
+            a:
+              script: echo a
+            b:
+              script: echo b
+              needs: [a]
+            c:
+              script: echo c
+              needs: [a]
+            d:
+              script: echo d
+              needs: [b, c]
+        """)
+        self.assertNotIn("circular-dependency", _issue_rules(result))
+
+
+class TestDuplicateStages(unittest.TestCase):
+    """Repeated stage names produce one warning per name with a count."""
+
+    def test_duplicate_reported_once_with_count(self):
+        """A stage listed three times yields a single warning."""
+        _, result = _run_syntax("""
+            stages: [build, test, build, build]
+            job:
+              stage: build
+              script: echo hi
+        """)
+        dupes = [
+            issue["message"] for issue in result.get("issues", [])
+            if issue["rule"] == "stage-duplicate"
+        ]
+        self.assertEqual(dupes, ["Duplicate stage 'build' (3 times)"])
+
+
+class TestExtendsGraph(unittest.TestCase):
+    """Extends checks walk the graph iteratively, without recursion limits."""
+
+    def test_deep_chain_reports_depth_limit(self):
+        """A chain deeper than the interpreter recursion limit still validates."""
+        depth = sys.getrecursionlimit() + 100
+        lines = [".t0:", "  script: echo base"]
+        for i in range(1, depth):
+            lines += [f".t{i}:", f"  extends: .t{i - 1}"]
+        lines += ["job:", f"  extends: .t{depth - 1}"]
+        proc, result = _run_syntax("\n".join(lines))
+        self.assertEqual(proc.stderr, "")
+        self.assertIn("gitlab-limit-extends-depth", _issue_rules(result))
+
+    def test_cycle_reported_without_leading_jobs(self):
+        """The cycle message starts at the job that closes the loop."""
+        _, result = _run_syntax("""
+            job:
+              extends: .a
+            .a:
+              extends: .b
+            .b:
+              script: echo b
+              extends: .a
+        """)
+        cycles = [
+            issue["message"] for issue in result.get("issues", [])
+            if issue["rule"] == "circular-extends"
+        ]
+        self.assertEqual(cycles, ["Circular extends detected: .a -> .b -> .a"])
+
+    def test_each_extends_cycle_is_reported(self):
+        """Two disjoint extends cycles produce two circular-extends errors."""
+        _, result = _run_syntax("""
+            .a:
+              script: echo a
+              extends: .b
+            .b:
+              extends: .a
+            .c:
+              script: echo c
+              extends: [.d]
+            .d:
+              extends: .c
+        """)
+        cycles = [
+            issue["message"] for issue in result.get("issues", [])
+            if issue["rule"] == "circular-extends"
+        ]
+        self.assertEqual(
+            cycles,
+            [
+                "Circular extends detected: .a -> .b -> .a",
+                "Circular extends detected: .c -> .d -> .c",
+            ],
+        )
+
+
+class TestMinSeverity(unittest.TestCase):
+    """--min-severity filters findings without changing the pass/fail result."""
+
+    PIPELINE = """
+        include:
+          - local: ci/build.txt
+        job:
+          stage: nope
+          script: echo hi
+    """
+
+    def test_default_keeps_warnings(self):
+        """Without the flag, include warnings are reported with their path."""
+        _, result = _run_syntax(self.PIPELINE)
+        self.assertIn(
+            "Include item #1: local path 'ci/build.txt' should end with .yml or .yaml",
+            _issue_messages(result),
+        )
+
+    def test_error_threshold_drops_warnings(self):
+        """With --min-severity error only errors remain."""
+        proc, result = _run_syntax(self.PIPELINE, "--min-severity", "error")
+        self.assertEqual(proc.returncode, 1)
+        self.assertEqual(_issue_rules(result), ["job-stage-undefined"])
+        self.assertEqual(result["summary"]["warnings"], 0)
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -6,19 +6,29 @@ This script generates a Declarative Jenkinsfile with specified configuration.
 """
 
 import argparse
+import functools
+import io
 import re
+import string
 import sys
 from pathlib import Path
 
-# Add lib to path
-sys.path.insert(0, str(Path(__file__).parent / 'lib'))
-
-from common_patterns import PipelinePatterns, StageTemplates, PostConditions, EnvironmentTemplates
-from syntax_helpers import DeclarativeSyntax, FormattingHelpers, GroovySyntax, ValidationHelpers
+# Helpers live in the sibling lib package, importable because the script's
+# own directory is on sys.path
+from lib.common_patterns import PipelinePatterns, StageTemplates, PostConditions, EnvironmentTemplates
+from lib.syntax_helpers import DeclarativeSyntax, FormattingHelpers, GroovySyntax, ValidationHelpers
 
 
 _INLINE_YAML_KEY_PATTERN = re.compile(r'^\s*[\w.\-"\']+\s*:\s*.*$')
 
+# Custom stage block; name and cmd are already-quoted Groovy literals
+_CUSTOM_STAGE_TEMPLATE = string.Template("""
+        stage($name) {
+            steps {
+                sh $cmd
+            }
+        }""")
+
 
 def _looks_like_inline_yaml(value):
     """Return True if the input resembles inline YAML content."""
@@ -54,12 +64,17 @@ class DeclarativePipelineGenerator:
 
     def __init__(self, config):
         self.config = config
-        self.pipeline_parts = []
+        self._buf = io.StringIO()
+
+    def _emit(self, text):
+        """Write one block of pipeline text followed by a newline"""
+        self._buf.write(text)
+        self._buf.write('\n')
 
     def generate(self):
         """Generate complete declarative pipeline"""
         # Start pipeline block
-        self.pipeline_parts.append("pipeline {")
+        self._emit("pipeline {")
 
         # Add agent
         self._add_agent()
@@ -86,10 +101,10 @@ class DeclarativePipelineGenerator:
         self._add_post()
 
         # Close pipeline block
-        self.pipeline_parts.append("}")
+        self._emit("}")
 
         # Format and return
-        content = '\n'.join(self.pipeline_parts)
+        content = self._buf.getvalue()
         return FormattingHelpers.format_jenkinsfile(
             FormattingHelpers.add_header_comment(
                 content,
@@ -131,7 +146,7 @@ class DeclarativePipelineGenerator:
         else:
             agent_block = DeclarativeSyntax.agent_block('any')
 
-        self.pipeline_parts.append(agent_block)
+        self._emit(agent_block)
 
     def _add_environment(self):
         """Add environment variables"""
@@ -141,8 +156,8 @@ class DeclarativePipelineGenerator:
         if env_vars or credentials:
             env_block = DeclarativeSyntax.environment_block(env_vars, credentials)
             if env_block:
-                self.pipeline_parts.append("")
-                self.pipeline_parts.append(env_block)
+                self._emit("")
+                self._emit(env_block)
 
     def _add_parameters(self):
         """Add parameters"""
@@ -151,8 +166,8 @@ class DeclarativePipelineGenerator:
         if parameters:
             param_block = DeclarativeSyntax.parameters_block(parameters)
             if param_block:
-                self.pipeline_parts.append("")
-                self.pipeline_parts.append(param_block)
+                self._emit("")
+                self._emit(param_block)
 
     def _add_options(self):
         """Add options"""
@@ -161,8 +176,8 @@ class DeclarativePipelineGenerator:
         if options:
             options_block = DeclarativeSyntax.options_block(options)
             if options_block:
-                self.pipeline_parts.append("")
-                self.pipeline_parts.append(options_block)
+                self._emit("")
+                self._emit(options_block)
 
     def _add_triggers(self):
         """Add triggers"""
@@ -171,8 +186,8 @@ class DeclarativePipelineGenerator:
         if triggers:
             triggers_block = DeclarativeSyntax.triggers_block(triggers)
             if triggers_block:
-                self.pipeline_parts.append("")
-                self.pipeline_parts.append(triggers_block)
+                self._emit("")
+                self._emit(triggers_block)
 
     def _add_tools(self):
         """Add tools"""
@@ -181,81 +196,110 @@ class DeclarativePipelineGenerator:
         if tools:
             tools_block = DeclarativeSyntax.tools_block(tools)
             if tools_block:
-                self.pipeline_parts.append("")
-                self.pipeline_parts.append(tools_block)
+                self._emit("")
+                self._emit(tools_block)
 
     def _add_stages(self):
         """Add stages based on configuration"""
-        self.pipeline_parts.append("")
-        self.pipeline_parts.append("    stages {")
+        self._emit("")
+        self._emit("    stages {")
 
         # Get stage list from config or use default
         stages = self.config.get('stages', ['build', 'test'])
 
-        # Get build tool pattern if specified
-        build_tool = self.config.get('build_tool', 'maven')
-        pattern = PipelinePatterns.ci_pattern(build_tool)
-
         # Generate stages based on type
+        handlers = self._STAGE_HANDLERS
         for stage in stages:
-            if stage == 'checkout':
-                self.pipeline_parts.append(StageTemplates.checkout_stage(
-                    scm_url=self.config.get('scm_url'),
-                    branch=self.config.get('branch', 'main'),
-                    credentials=self.config.get('scm_credentials')
-                ))
-            elif stage == 'build':
-                build_cmd = self.config.get('build_cmd', pattern['build_cmd'])
-                self.pipeline_parts.append(StageTemplates.build_stage(build_cmd))
-            elif stage == 'test':
-                test_cmd = self.config.get('test_cmd', pattern['test_cmd'])
-                test_results = self.config.get('test_results', pattern['test_results'])
-                self.pipeline_parts.append(StageTemplates.test_stage(test_cmd, test_results))
-            elif stage == 'deploy':
-                deploy_cmd = self.config.get('deploy_cmd', './deploy.sh')
-                environment = self.config.get('deploy_env', 'production')
-                approval = self.config.get('deploy_approval', True)
-                approvers = self.config.get('deploy_approvers', 'admin')
-                self.pipeline_parts.append(StageTemplates.deploy_stage(
-                    environment, deploy_cmd, approval, approvers
-                ))
-            elif stage == 'docker-build':
-                image_name = self.config.get('docker_image_name', 'myapp')
-                dockerfile = self.config.get('dockerfile', 'Dockerfile')
-                self.pipeline_parts.append(StageTemplates.docker_build_stage(image_name, dockerfile))
-            elif stage == 'docker-push':
-                image_name = self.config.get('docker_image_name', 'myapp')
-                registry = self.config.get('docker_registry')
-                registry_creds = self.config.get('docker_registry_credentials')
-                self.pipeline_parts.append(StageTemplates.docker_push_stage(
-                    image_name, registry, registry_creds
-                ))
-            elif stage == 'parallel-tests':
-                test_types = self.config.get('test_types', ['unit', 'integration'])
-                # Avoid redundant failFast true at stage level when
-                # parallelsAlwaysFailFast() is already set globally in options
-                has_global_fail_fast = self.config.get('options', {}).get('parallelsAlwaysFailFast', False)
-                stage_fail_fast = self.config.get('parallel_fail_fast', True) and not has_global_fail_fast
-                self.pipeline_parts.append(StageTemplates.parallel_test_stage(
-                    test_types,
-                    fail_fast=stage_fail_fast,
-                ))
-            else:
-                # Custom stage
-                stage_name = ValidationHelpers.normalize_stage_name(
-                    stage.replace('-', ' ').replace('_', ' ').title()
-                )
-                stage_name_literal = GroovySyntax.single_quoted_literal(stage_name)
-                custom_cmd = self.config.get(f'{stage}_cmd', f'echo "Running {stage_name}"')
-                custom_cmd_literal = GroovySyntax.single_quoted_literal(custom_cmd)
-                self.pipeline_parts.append(f"""
-        stage({stage_name_literal}) {{
-            steps {{
-                sh {custom_cmd_literal}
-            }}
-        }}""")
-
-        self.pipeline_parts.append("    }")
+            self._emit(handlers.get(stage, DeclarativePipelineGenerator._custom_stage)(self, stage))
+
+        self._emit("    }")
+
+    @functools.cached_property
+    def _pattern(self):
+        """Build tool pattern, looked up only when a build or test stage needs it"""
+        return PipelinePatterns.ci_pattern(self.config.get('build_tool', 'maven'))
+
+    def _checkout_stage(self, stage):
+        """Render the checkout stage"""
+        cfg = self.config
+        return StageTemplates.checkout_stage(
+            scm_url=cfg.get('scm_url'),
+            branch=cfg.get('branch', 'main'),
+            credentials=cfg.get('scm_credentials')
+        )
+
+    def _build_stage(self, stage):
+        """Render the build stage"""
+        cfg = self.config
+        build_cmd = cfg['build_cmd'] if 'build_cmd' in cfg else self._pattern['build_cmd']
+        return StageTemplates.build_stage(build_cmd)
+
+    def _test_stage(self, stage):
+        """Render the test stage"""
+        cfg = self.config
+        test_cmd = cfg['test_cmd'] if 'test_cmd' in cfg else self._pattern['test_cmd']
+        test_results = cfg['test_results'] if 'test_results' in cfg else self._pattern['test_results']
+        return StageTemplates.test_stage(test_cmd, test_results)
+
+    def _deploy_stage(self, stage):
+        """Render the deploy stage"""
+        cfg = self.config
+        deploy_cmd = cfg.get('deploy_cmd', './deploy.sh')
+        environment = cfg.get('deploy_env', 'production')
+        approval = cfg.get('deploy_approval', True)
+        approvers = cfg.get('deploy_approvers', 'admin')
+        return StageTemplates.deploy_stage(environment, deploy_cmd, approval, approvers)
+
+    def _docker_build_stage(self, stage):
+        """Render the docker-build stage"""
+        cfg = self.config
+        image_name = cfg.get('docker_image_name', 'myapp')
+        dockerfile = cfg.get('dockerfile', 'Dockerfile')
+        return StageTemplates.docker_build_stage(image_name, dockerfile)
+
+    def _docker_push_stage(self, stage):
+        """Render the docker-push stage"""
+        cfg = self.config
+        image_name = cfg.get('docker_image_name', 'myapp')
+        registry = cfg.get('docker_registry')
+        registry_creds = cfg.get('docker_registry_credentials')
+        return StageTemplates.docker_push_stage(image_name, registry, registry_creds)
+
+    def _parallel_tests_stage(self, stage):
+        """Render the parallel-tests stage"""
+        cfg = self.config
+        test_types = cfg.get('test_types', ['unit', 'integration'])
+        # Avoid redundant failFast true at stage level when
+        # parallelsAlwaysFailFast() is already set globally in options
+        has_global_fail_fast = cfg.get('options', {}).get('parallelsAlwaysFailFast', False)
+        stage_fail_fast = cfg.get('parallel_fail_fast', True) and not has_global_fail_fast
+        return StageTemplates.parallel_test_stage(
+            test_types,
+            fail_fast=stage_fail_fast,
+        )
+
+    def _custom_stage(self, stage):
+        """Render a custom stage running <stage>_cmd"""
+        stage_name = ValidationHelpers.normalize_stage_name(
+            stage.replace('-', ' ').replace('_', ' ').title()
+        )
+        stage_name_literal = GroovySyntax.single_quoted_literal(stage_name)
+        custom_cmd = self.config.get(f'{stage}_cmd', f'echo "Running {stage_name}"')
+        return _CUSTOM_STAGE_TEMPLATE.substitute(
+            name=stage_name_literal,
+            cmd=GroovySyntax.single_quoted_literal(custom_cmd),
+        )
+
+    # Stage key -> renderer; unknown keys fall back to _custom_stage
+    _STAGE_HANDLERS = {
+        'checkout': _checkout_stage,
+        'build': _build_stage,
+        'test': _test_stage,
+        'deploy': _deploy_stage,
+        'docker-build': _docker_build_stage,
+        'docker-push': _docker_push_stage,
+        'parallel-tests': _parallel_tests_stage,
+    }
 
     def _add_post(self):
         """Add post conditions"""
@@ -275,8 +319,8 @@ class DeclarativePipelineGenerator:
             post_block = PostConditions.standard_post(artifacts, cleanup)
 
         if post_block:
-            self.pipeline_parts.append("")
-            self.pipeline_parts.append(post_block)
+            self._emit("")
+            self._emit(post_block)
 
 
 def parse_args():
@@ -469,7 +513,7 @@ def main():
     # Write output
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(jenkinsfile_content)
+    FormattingHelpers.write_jenkinsfile(output_path, jenkinsfile_content)
 
     print(f"✓ Generated Declarative Jenkinsfile: {args.output}")
     print(f"  Pipeline: {args.name}")
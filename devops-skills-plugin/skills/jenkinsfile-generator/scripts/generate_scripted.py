@@ -6,23 +6,79 @@ This script generates a Scripted Jenkinsfile with specified configuration.
 """
 
 import argparse
+import functools
+import string
 import sys
 import os
 from pathlib import Path
 
-# Add lib to path
-sys.path.insert(0, str(Path(__file__).parent / 'lib'))
+# Helpers live in the sibling lib package, importable because the script's
+# own directory is on sys.path
+from lib.common_patterns import PipelinePatterns
+from lib.syntax_helpers import ScriptedSyntax, FormattingHelpers, ValidationHelpers
 
-from common_patterns import PipelinePatterns
-from syntax_helpers import ScriptedSyntax, FormattingHelpers, ValidationHelpers
+
+class _GroovyTemplate(string.Template):
+    """string.Template using %name placeholders so Groovy ${...} stays verbatim"""
+    delimiter = '%'
+
+
+# Fixed Groovy fragments
+_CATCH_DEFAULT = (
+    "        currentBuild.result = 'FAILURE'\n"
+    '        echo "Pipeline failed: ${e.message}"\n'
+    "        throw e"
+)
+_FINALLY_CLEANUP = "        deleteDir()"
+
+# Multi-line Groovy templates, compiled once at import
+_CHECKOUT_SCM_GIT = _GroovyTemplate("""        checkout scmGit(
+            branches: [[name: '*/%branch']],
+            userRemoteConfigs: [[
+                url: '%scm_url',
+                credentialsId: '%credentials'
+            ]]
+        )""")
+
+_CATCH_WITH_EMAIL = _GroovyTemplate("""        currentBuild.result = 'FAILURE'
+        emailext(
+            subject: "Build Failed: ${env.JOB_NAME} #${env.BUILD_NUMBER}",
+            body: "Error: ${e.message}\\nCheck console output at ${env.BUILD_URL}",
+            to: '%email'
+        )
+        throw e""")
+
+_DOCKER_BUILD = _GroovyTemplate(
+    """        def customImage = docker.build('%image_name:${BUILD_NUMBER}', '-f %dockerfile .')"""
+)
+
+_DOCKER_PUSH = _GroovyTemplate("""        docker.image('%image_name:${BUILD_NUMBER}').push()
+        docker.image('%image_name:${BUILD_NUMBER}').push('latest')""")
+
+_DOCKER_PUSH_WITH_REGISTRY = _GroovyTemplate("""        docker.withRegistry('%registry', '%registry_creds') {
+            docker.image('%image_name:${BUILD_NUMBER}').push()
+            docker.image('%image_name:${BUILD_NUMBER}').push('latest')
+        }""")
 
 
 class ScriptedPipelineGenerator:
     """Generator for Scripted Jenkins Pipelines"""
 
+    __slots__ = (
+        'config', 'pipeline_parts', '_pattern', '_docker_image', '_docker_args',
+        '_docker_image_name', '_notification_email', '_cleanup',
+    )
+
     def __init__(self, config):
         self.config = config
         self.pipeline_parts = []
+        self._pattern = PipelinePatterns.ci_pattern(config.get('build_tool', 'maven'))
+        # Settings shared by several stage generators, read once
+        self._docker_image = config.get('docker_image')
+        self._docker_args = config.get('docker_args', '')
+        self._docker_image_name = config.get('docker_image_name', 'myapp')
+        self._notification_email = config.get('notification_email')
+        self._cleanup = config.get('cleanup', True)
 
     def generate(self):
         """Generate complete scripted pipeline"""
@@ -61,8 +117,6 @@ class ScriptedPipelineGenerator:
 
         # Get stages
         stages = self.config.get('stages', ['build', 'test'])
-        build_tool = self.config.get('build_tool', 'maven')
-        pattern = PipelinePatterns.ci_pattern(build_tool)
 
         # Determine if we need try-catch-finally
         use_error_handling = self.config.get('error_handling', True)
@@ -70,65 +124,46 @@ class ScriptedPipelineGenerator:
         if use_error_handling:
             # Build try block content.
             # Re-indent by 4 extra spaces so stages sit inside try {} correctly.
-            raw_try_content = self._build_stages_content(stages, pattern)
+            raw_try_content = self._build_stages_content(stages)
             try_content = self._indent_lines(raw_try_content, 4)
 
-            # Build catch block
-            catch_content = """        currentBuild.result = 'FAILURE'
-        echo "Pipeline failed: ${e.message}"
-        throw e"""
+            # Build catch block, with a notification if configured
+            if self._notification_email:
+                catch_content = _CATCH_WITH_EMAIL.substitute(email=self._notification_email)
+            else:
+                catch_content = _CATCH_DEFAULT
 
             # Build finally block (cleanup)
-            finally_content = ""
-            if self.config.get('cleanup', True):
-                finally_content = "        deleteDir()"
-
-            # Add notification in catch if configured
-            if self.config.get('notification_email'):
-                catch_content = f"""        currentBuild.result = 'FAILURE'
-        emailext(
-            subject: "Build Failed: ${{env.JOB_NAME}} #${{env.BUILD_NUMBER}}",
-            body: "Error: ${{e.message}}\\nCheck console output at ${{env.BUILD_URL}}",
-            to: '{self.config.get('notification_email')}'
-        )
-        throw e"""
+            finally_content = _FINALLY_CLEANUP if self._cleanup else ""
 
             node_content = ScriptedSyntax.try_catch_finally(
                 try_content, catch_content, finally_content
             )
         else:
             # Simple stages without error handling
-            node_content = self._build_stages_content(stages, pattern)
-            if self.config.get('cleanup', True):
-                node_content += "\n\n    deleteDir()"
+            node_parts = [self._build_stages_content(stages)]
+            if self._cleanup:
+                node_parts.append("    deleteDir()")
+            node_content = '\n\n'.join(node_parts)
 
         return node_content
 
-    def _build_stages_content(self, stages, pattern):
+    def _build_stages_content(self, stages):
         """Build stages content"""
         stage_blocks = []
 
+        handlers = self._STAGE_HANDLERS
         for stage in stages:
-            if stage == 'checkout':
-                stage_content = self._generate_checkout_stage()
-            elif stage == 'build':
-                stage_content = self._generate_build_stage(pattern)
-            elif stage == 'test':
-                stage_content = self._generate_test_stage(pattern)
-            elif stage == 'deploy':
-                stage_content = self._generate_deploy_stage()
-            elif stage == 'docker-build':
-                stage_content = self._generate_docker_build_stage()
-            elif stage == 'docker-push':
-                stage_content = self._generate_docker_push_stage()
-            elif stage == 'parallel-tests':
-                stage_content = self._generate_parallel_tests_stage()
+            handler = handlers.get(stage)
+            if handler is not None:
+                generate_stage, stage_display_name = handler
+                stage_content = generate_stage(self)
             else:
                 # Custom stage
                 custom_cmd = self.config.get(f'{stage}_cmd', f'echo "Running {stage}"')
                 stage_content = f"""        sh '{custom_cmd}'"""
+                stage_display_name = stage.replace('-', ' ').replace('_', ' ').title()
 
-            stage_display_name = stage.replace('-', ' ').replace('_', ' ').title()
             stage_block = ScriptedSyntax.stage_block(
                 stage_display_name,
                 stage_content
@@ -145,45 +180,37 @@ class ScriptedPipelineGenerator:
 
         if scm_url:
             if credentials:
-                return f"""        checkout scmGit(
-            branches: [[name: '*/{branch}']],
-            userRemoteConfigs: [[
-                url: '{scm_url}',
-                credentialsId: '{credentials}'
-            ]]
-        )"""
+                return _CHECKOUT_SCM_GIT.substitute(
+                    branch=branch, scm_url=scm_url, credentials=credentials
+                )
             else:
                 return f"""        git branch: '{branch}', url: '{scm_url}'"""
         else:
             return """        checkout scm"""
 
-    def _generate_build_stage(self, pattern):
+    def _generate_build_stage(self):
         """Generate build stage"""
-        build_cmd = self.config.get('build_cmd', pattern['build_cmd'])
+        build_cmd = self.config.get('build_cmd', self._pattern['build_cmd'])
 
         # Check if using Docker
-        if self.config.get('docker_image'):
-            docker_image = self.config.get('docker_image')
-            docker_args = self.config.get('docker_args', '')
+        if self._docker_image:
             content = f"""            sh '{build_cmd}'"""
 
-            return ScriptedSyntax.docker_inside_block(docker_image, content, docker_args)
+            return ScriptedSyntax.docker_inside_block(self._docker_image, content, self._docker_args)
         else:
             return f"""        sh '{build_cmd}'"""
 
-    def _generate_test_stage(self, pattern):
+    def _generate_test_stage(self):
         """Generate test stage"""
-        test_cmd = self.config.get('test_cmd', pattern['test_cmd'])
-        test_results = self.config.get('test_results', pattern['test_results'])
+        test_cmd = self.config.get('test_cmd', self._pattern['test_cmd'])
+        test_results = self.config.get('test_results', self._pattern['test_results'])
 
         content = f"""        sh '{test_cmd}'
         junit '{test_results}'"""
 
         # Check if using Docker
-        if self.config.get('docker_image'):
-            docker_image = self.config.get('docker_image')
-            docker_args = self.config.get('docker_args', '')
-            return ScriptedSyntax.docker_inside_block(docker_image, content, docker_args)
+        if self._docker_image:
+            return ScriptedSyntax.docker_inside_block(self._docker_image, content, self._docker_args)
         else:
             return content
 
@@ -202,51 +229,68 @@ class ScriptedPipelineGenerator:
 
     def _generate_docker_build_stage(self):
         """Generate Docker build stage"""
-        image_name = self.config.get('docker_image_name', 'myapp')
+        image_name = self._docker_image_name
         dockerfile = self.config.get('dockerfile', 'Dockerfile')
 
-        return f"""        def customImage = docker.build('{image_name}:${{BUILD_NUMBER}}', '-f {dockerfile} .')"""
+        return _DOCKER_BUILD.substitute(image_name=image_name, dockerfile=dockerfile)
 
     def _generate_docker_push_stage(self):
         """Generate Docker push stage"""
-        image_name = self.config.get('docker_image_name', 'myapp')
+        image_name = self._docker_image_name
         registry = self.config.get('docker_registry')
         registry_creds = self.config.get('docker_registry_credentials')
 
         if registry and registry_creds:
-            return f"""        docker.withRegistry('{registry}', '{registry_creds}') {{
-            docker.image('{image_name}:${{BUILD_NUMBER}}').push()
-            docker.image('{image_name}:${{BUILD_NUMBER}}').push('latest')
-        }}"""
+            return _DOCKER_PUSH_WITH_REGISTRY.substitute(
+                registry=registry, registry_creds=registry_creds, image_name=image_name
+            )
         else:
-            return f"""        docker.image('{image_name}:${{BUILD_NUMBER}}').push()
-        docker.image('{image_name}:${{BUILD_NUMBER}}').push('latest')"""
+            return _DOCKER_PUSH.substitute(image_name=image_name)
 
     def _generate_parallel_tests_stage(self):
         """Generate parallel test stages"""
         test_types = self.config.get('test_types', ['unit', 'integration'])
 
-        parallel_stages = {}
-        for test_type in test_types:
-            parallel_stages[f'{test_type.capitalize()} Tests'] = f"""            sh 'npm run test:{test_type}'"""
-
         # Return just the content without the stage wrapper
-        # because ScriptedSyntax.parallel_block will be wrapped in a stage
-        parallel_content = []
-        for name, content in parallel_stages.items():
-            parallel_content.append(f"""        '{name}': {{
+        # because ScriptedSyntax.parallel_block will be wrapped in a stage.
+        # Keyed by branch name so repeated test types yield one branch.
+        branches = {}
+        for test_type in test_types:
+            name = f'{test_type.capitalize()} Tests'
+            branches[name] = f"""        '{name}': {{
             node {{
-{content}
+                sh 'npm run test:{test_type}'
             }}
-        }}""")
+        }}"""
 
-        return f"""        parallel(
-{','.join(parallel_content)}
-        )"""
+        return "        parallel(\n" + ',\n'.join(branches.values()) + "\n        )"
+
+    # Stage key -> (generator, display name); unknown keys become custom 'sh' stages
+    _STAGE_HANDLERS = {
+        'checkout': (_generate_checkout_stage, 'Checkout'),
+        'build': (_generate_build_stage, 'Build'),
+        'test': (_generate_test_stage, 'Test'),
+        'deploy': (_generate_deploy_stage, 'Deploy'),
+        'docker-build': (_generate_docker_build_stage, 'Docker Build'),
+        'docker-push': (_generate_docker_push_stage, 'Docker Push'),
+        'parallel-tests': (_generate_parallel_tests_stage, 'Parallel Tests'),
+    }
 
 
-def parse_args():
-    """Parse command line arguments"""
+# Output directories already created by this process
+_CREATED_DIRS = set()
+
+
+def _ensure_dir(path):
+    """Create path (and parents) unless this process already did so"""
+    if path not in _CREATED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _CREATED_DIRS.add(path)
+
+
+@functools.lru_cache(maxsize=1)
+def _build_parser():
+    """Build the command line parser once and reuse it"""
     parser = argparse.ArgumentParser(
         description='Generate Scripted Jenkins Pipeline',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -325,7 +369,12 @@ Examples:
     parser.add_argument('--test-types', default='unit,integration',
                         help='Comma-separated test types for parallel-tests stage')
 
-    return parser.parse_args()
+    return parser
+
+
+def parse_args():
+    """Parse command line arguments"""
+    return _build_parser().parse_args()
 
 
 def main():
@@ -360,7 +409,7 @@ def main():
         'error_handling': not args.no_error_handling,
         'cleanup': not args.no_cleanup,
         'notification_email': args.notification_email,
-        'test_types': args.test_types.split(','),
+        'test_types': [t.strip() for t in args.test_types.split(',') if t.strip()],
     }
 
     # Add custom commands if specified
@@ -379,18 +428,25 @@ def main():
 
     # Write output
     output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(jenkinsfile_content)
-
-    print(f"✓ Generated Scripted Jenkinsfile: {args.output}")
-    print(f"  Pipeline: {args.name}")
-    print(f"  Stages: {', '.join(config['stages'])}")
+    _ensure_dir(str(output_path.parent))
+    FormattingHelpers.write_jenkinsfile(output_path, jenkinsfile_content)
+
+    # Report in a single write
+    summary = [
+        f"✓ Generated Scripted Jenkinsfile: {args.output}",
+        f"  Pipeline: {args.name}",
+        f"  Stages: {', '.join(config['stages'])}",
+    ]
     if args.agent_label:
-        print(f"  Agent Label: {args.agent_label}")
-    print("\n" + "="*60)
-    print("NEXT STEP: Validate the generated Jenkinsfile")
-    print("  Use: jenkinsfile-validator skill")
-    print("="*60)
+        summary.append(f"  Agent Label: {args.agent_label}")
+    summary += [
+        "",
+        "=" * 60,
+        "NEXT STEP: Validate the generated Jenkinsfile",
+        "  Use: jenkinsfile-validator skill",
+        "=" * 60,
+    ]
+    sys.stdout.write('\n'.join(summary) + '\n')
 
     return 0
 
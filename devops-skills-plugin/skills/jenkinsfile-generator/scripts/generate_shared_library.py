@@ -28,258 +28,227 @@ Structure generated:
 """
 
 import argparse
+import functools
 import os
-from datetime import datetime
+import string
+import sys
+import time
 
+from lib.syntax_helpers import FormattingHelpers
 
-class SharedLibraryGenerator:
-    """Generates Jenkins Shared Library scaffolding"""
 
-    def __init__(self, name, package='org.example', output_dir='.'):
-        self.name = name
-        self.package = package
-        self.package_path = package.replace('.', '/')
-        self.output_dir = os.path.join(output_dir, name)
-        self.timestamp = datetime.now().strftime('%Y-%m-%d')
+# Generation date stamped into every file, fixed for the life of the process
+_TODAY = time.strftime('%Y-%m-%d')
 
-    def generate(self):
-        """Generate the complete shared library structure"""
-        self._create_directory_structure()
-        self._generate_src_files()
-        self._generate_vars_files()
-        self._generate_resources()
-        self._generate_readme()
-        print(f"Shared library '{self.name}' generated at: {self.output_dir}")
 
-    def _create_directory_structure(self):
-        """Create the directory structure"""
-        dirs = [
-            f"src/{self.package_path}",
-            "vars",
-            f"resources/{self.package_path}",
-            "test/groovy",
-        ]
-        for dir_path in dirs:
-            os.makedirs(os.path.join(self.output_dir, dir_path), exist_ok=True)
+class _GroovyTemplate(string.Template):
+    """Template with %name placeholders; Groovy ${...} and braces pass through"""
+    delimiter = '%'
+
 
-    def _generate_src_files(self):
-        """Generate src/ Groovy class files"""
-        # Utils.groovy
-        utils_content = f'''package {self.package}
+# src/ class templates: a shared header followed by each class body
+_CLASS_HEADER = _GroovyTemplate('''package %package
 
 /**
- * Utility class for common pipeline operations
- * Generated: {self.timestamp}
+ * %description
+ * Generated: %timestamp
  */
-class Utils implements Serializable {{
+class %cls implements Serializable {
+''')
 
+_UTILS_BODY = '''
     /**
      * Get the current Git branch name
      */
-    static String getBranchName(script) {{
+    static String getBranchName(script) {
         return script.sh(
             script: 'git rev-parse --abbrev-ref HEAD',
             returnStdout: true
         ).trim()
-    }}
+    }
 
     /**
      * Get the current Git commit SHA
      */
-    static String getCommitSha(script) {{
+    static String getCommitSha(script) {
         return script.sh(
             script: 'git rev-parse HEAD',
             returnStdout: true
         ).trim()
-    }}
+    }
 
     /**
      * Get short commit SHA (7 characters)
      */
-    static String getShortCommitSha(script) {{
+    static String getShortCommitSha(script) {
         return script.sh(
             script: 'git rev-parse --short HEAD',
             returnStdout: true
         ).trim()
-    }}
+    }
 
     /**
      * Check if running on a specific branch
      */
-    static boolean isMainBranch(script) {{
+    static boolean isMainBranch(script) {
         def branch = getBranchName(script)
         return branch == 'main' || branch == 'master'
-    }}
+    }
 
     /**
      * Validate required environment variables
      */
-    static void validateEnvVars(script, List<String> requiredVars) {{
-        def missing = requiredVars.findAll {{ !script.env[it] }}
-        if (missing) {{
-            script.error("Missing required environment variables: ${{missing.join(', ')}}")
-        }}
-    }}
-}}
+    static void validateEnvVars(script, List<String> requiredVars) {
+        def missing = requiredVars.findAll { !script.env[it] }
+        if (missing) {
+            script.error("Missing required environment variables: ${missing.join(', ')}")
+        }
+    }
+}
 '''
-        self._write_file(f"src/{self.package_path}/Utils.groovy", utils_content)
-
-        # Docker.groovy
-        docker_content = f'''package {self.package}
-
-/**
- * Docker utility class for container operations
- * Generated: {self.timestamp}
- */
-class Docker implements Serializable {{
 
+_DOCKER_BODY = '''
     private def script
     private String registry
     private String credentialsId
 
-    Docker(script, String registry = null, String credentialsId = null) {{
+    Docker(script, String registry = null, String credentialsId = null) {
         this.script = script
         this.registry = registry
         this.credentialsId = credentialsId
-    }}
+    }
 
     /**
      * Build a Docker image
      */
-    def build(String imageName, String tag = 'latest', String dockerfile = 'Dockerfile', String context = '.') {{
-        def fullImageName = registry ? "${{registry}}/${{imageName}}" : imageName
-        def imageTag = "${{fullImageName}}:${{tag}}"
+    def build(String imageName, String tag = 'latest', String dockerfile = 'Dockerfile', String context = '.') {
+        def fullImageName = registry ? "${registry}/${imageName}" : imageName
+        def imageTag = "${fullImageName}:${tag}"
 
-        script.echo "Building Docker image: ${{imageTag}}"
-        return script.docker.build(imageTag, "-f ${{dockerfile}} ${{context}}")
-    }}
+        script.echo "Building Docker image: ${imageTag}"
+        return script.docker.build(imageTag, "-f ${dockerfile} ${context}")
+    }
 
     /**
      * Push a Docker image to registry
      */
-    def push(def image, String... tags) {{
-        if (!registry) {{
+    def push(def image, String... tags) {
+        if (!registry) {
             script.error("Registry not configured for push operation")
-        }}
+        }
 
-        script.docker.withRegistry("https://${{registry}}", credentialsId) {{
-            tags.each {{ tag ->
-                script.echo "Pushing image with tag: ${{tag}}"
+        script.docker.withRegistry("https://${registry}", credentialsId) {
+            tags.each { tag ->
+                script.echo "Pushing image with tag: ${tag}"
                 image.push(tag)
-            }}
-        }}
-    }}
+            }
+        }
+    }
 
     /**
      * Build and push in one operation
      */
-    def buildAndPush(String imageName, List<String> tags = ['latest']) {{
+    def buildAndPush(String imageName, List<String> tags = ['latest']) {
         def image = build(imageName, tags[0])
         push(image, *tags)
         return image
-    }}
+    }
 
     /**
      * Run a container for testing
      */
-    def test(String imageName, String command) {{
-        script.sh "docker run --rm ${{imageName}} ${{command}}"
-    }}
+    def test(String imageName, String command) {
+        script.sh "docker run --rm ${imageName} ${command}"
+    }
 
     /**
      * Clean up dangling images
      */
-    def cleanup() {{
+    def cleanup() {
         script.sh 'docker image prune -f || true'
-    }}
-}}
+    }
+}
 '''
-        self._write_file(f"src/{self.package_path}/Docker.groovy", docker_content)
-
-        # Notifications.groovy
-        notifications_content = f'''package {self.package}
-
-/**
- * Notification utilities for pipeline status updates
- * Generated: {self.timestamp}
- */
-class Notifications implements Serializable {{
 
+_NOTIFICATIONS_BODY = '''
     private def script
 
-    Notifications(script) {{
+    Notifications(script) {
         this.script = script
-    }}
+    }
 
     /**
      * Send Slack notification
      */
-    def slack(String channel, String message, String color = 'good') {{
-        try {{
+    def slack(String channel, String message, String color = 'good') {
+        try {
             script.slackSend(
                 channel: channel,
                 color: color,
                 message: message
             )
-        }} catch (Exception e) {{
-            script.echo "Warning: Failed to send Slack notification: ${{e.message}}"
-        }}
-    }}
+        } catch (Exception e) {
+            script.echo "Warning: Failed to send Slack notification: ${e.message}"
+        }
+    }
 
     /**
      * Send email notification
      */
-    def email(String to, String subject, String body) {{
-        try {{
+    def email(String to, String subject, String body) {
+        try {
             script.emailext(
                 to: to,
                 subject: subject,
                 body: body,
                 mimeType: 'text/html'
             )
-        }} catch (Exception e) {{
-            script.echo "Warning: Failed to send email notification: ${{e.message}}"
-        }}
-    }}
+        } catch (Exception e) {
+            script.echo "Warning: Failed to send email notification: ${e.message}"
+        }
+    }
 
     /**
      * Send build status notification
      */
-    def buildStatus(String channel = null, String email = null) {{
+    def buildStatus(String channel = null, String email = null) {
         def status = script.currentBuild.currentResult ?: 'SUCCESS'
         def color = status == 'SUCCESS' ? 'good' : 'danger'
         def message = """
-            *Build ${{status}}*
-            Job: ${{script.env.JOB_NAME}} #${{script.env.BUILD_NUMBER}}
-            Branch: ${{script.env.BRANCH_NAME ?: 'N/A'}}
-            <${{script.env.BUILD_URL}}|View Build>
+            *Build ${status}*
+            Job: ${script.env.JOB_NAME} #${script.env.BUILD_NUMBER}
+            Branch: ${script.env.BRANCH_NAME ?: 'N/A'}
+            <${script.env.BUILD_URL}|View Build>
         """.stripIndent().trim()
 
-        if (channel) {{
+        if (channel) {
             slack(channel, message, color)
-        }}
+        }
 
-        if (email) {{
-            def subject = "[${{status}}] ${{script.env.JOB_NAME}} #${{script.env.BUILD_NUMBER}}"
+        if (email) {
+            def subject = "[${status}] ${script.env.JOB_NAME} #${script.env.BUILD_NUMBER}"
             def htmlBody = """
-                <h3>Build ${{status}}</h3>
+                <h3>Build ${status}</h3>
                 <ul>
-                    <li><b>Job:</b> ${{script.env.JOB_NAME}} #${{script.env.BUILD_NUMBER}}</li>
-                    <li><b>Branch:</b> ${{script.env.BRANCH_NAME ?: 'N/A'}}</li>
+                    <li><b>Job:</b> ${script.env.JOB_NAME} #${script.env.BUILD_NUMBER}</li>
+                    <li><b>Branch:</b> ${script.env.BRANCH_NAME ?: 'N/A'}</li>
                 </ul>
-                <p><a href="${{script.env.BUILD_URL}}">View Build</a></p>
+                <p><a href="${script.env.BUILD_URL}">View Build</a></p>
             """.stripIndent().trim()
             this.email(email, subject, htmlBody)
-        }}
-    }}
-}}
+        }
+    }
+}
 '''
-        self._write_file(f"src/{self.package_path}/Notifications.groovy", notifications_content)
 
-    def _generate_vars_files(self):
-        """Generate vars/ global variable files"""
-        # log.groovy - Logging utilities
-        log_groovy = '''/**
+_SRC_CLASSES = (
+    ('Utils', 'Utility class for common pipeline operations', _UTILS_BODY),
+    ('Docker', 'Docker utility class for container operations', _DOCKER_BODY),
+    ('Notifications', 'Notification utilities for pipeline status updates', _NOTIFICATIONS_BODY),
+)
+
+# vars/ global variable templates
+_LOG_GROOVY = _GroovyTemplate('''/**
  * Logging utilities for Jenkins pipelines
  *
  * Usage:
@@ -310,86 +279,80 @@ def debug(String message) {
         echo "\\033[35m[DEBUG]\\033[0m ${message}"
     }
 }
-'''
-        self._write_file("vars/log.groovy", log_groovy)
-        self._write_file("vars/log.txt", "Logging utilities: log.info(), log.warning(), log.error(), log.success(), log.debug()")
+''')
 
-        # buildApp.groovy - Standard build function
-        build_app_groovy = f'''/**
+_BUILD_APP_GROOVY = _GroovyTemplate('''/**
  * Standard application build function
  *
  * Usage:
- *   @Library('{self.name}') _
+ *   @Library('%name') _
  *   buildApp(
  *       buildTool: 'maven',
  *       jdkVersion: 'JDK-21'
  *   )
  */
 
-def call(Map config = [:]) {{
+def call(Map config = [:]) {
     def buildTool = config.get('buildTool', 'maven')
     def jdkVersion = config.get('jdkVersion', 'JDK-21')
     def skipTests = config.get('skipTests', false)
     def additionalArgs = config.get('additionalArgs', '')
 
-    pipeline {{
+    pipeline {
         agent any
 
-        tools {{
+        tools {
             jdk jdkVersion
-        }}
+        }
 
-        stages {{
-            stage('Checkout') {{
-                steps {{
+        stages {
+            stage('Checkout') {
+                steps {
                     checkout scm
-                }}
-            }}
+                }
+            }
 
-            stage('Build') {{
-                steps {{
-                    script {{
-                        switch(buildTool) {{
+            stage('Build') {
+                steps {
+                    script {
+                        switch(buildTool) {
                             case 'maven':
                                 def testFlag = skipTests ? '-DskipTests' : ''
-                                sh "mvn clean package ${{testFlag}} ${{additionalArgs}}"
+                                sh "mvn clean package ${testFlag} ${additionalArgs}"
                                 break
                             case 'gradle':
                                 def testFlag = skipTests ? '-x test' : ''
-                                sh "./gradlew clean build ${{testFlag}} ${{additionalArgs}}"
+                                sh "./gradlew clean build ${testFlag} ${additionalArgs}"
                                 break
                             case 'npm':
                                 sh 'npm ci'
-                                sh "npm run build ${{additionalArgs}}"
-                                if (!skipTests) {{
+                                sh "npm run build ${additionalArgs}"
+                                if (!skipTests) {
                                     sh 'npm test'
-                                }}
+                                }
                                 break
                             default:
-                                error "Unknown build tool: ${{buildTool}}"
-                        }}
-                    }}
-                }}
-            }}
-        }}
-
-        post {{
-            always {{
+                                error "Unknown build tool: ${buildTool}"
+                        }
+                    }
+                }
+            }
+        }
+
+        post {
+            always {
                 cleanWs()
-            }}
-        }}
-    }}
-}}
-'''
-        self._write_file("vars/buildApp.groovy", build_app_groovy)
-        self._write_file("vars/buildApp.txt", "Build application: buildApp(buildTool: 'maven', jdkVersion: 'JDK-21', skipTests: false)")
+            }
+        }
+    }
+}
+''')
 
-        # deployApp.groovy - Deployment function
-        deploy_app_groovy = f'''/**
+_DEPLOY_APP_GROOVY = _GroovyTemplate('''/**
  * Standard deployment function
  *
  * Usage:
- *   @Library('{self.name}') _
+ *   @Library('%name') _
  *   deployApp(
  *       environment: 'staging',
  *       kubeConfig: 'kubeconfig-staging',
@@ -397,7 +360,7 @@ def call(Map config = [:]) {{
  *   )
  */
 
-def call(Map config = [:]) {{
+def call(Map config = [:]) {
     def environment = config.get('environment', 'dev')
     def kubeConfig = config.get('kubeConfig')
     def namespace = config.get('namespace', 'default')
@@ -408,53 +371,50 @@ def call(Map config = [:]) {{
         .replaceAll(/[^a-z0-9-]/, '-')
         .replaceAll(/-+/, '-')
         .replaceAll(/^-|-$/, '')
-    if (deploymentName.length() > 63) {{
+    if (deploymentName.length() > 63) {
         deploymentName = deploymentName.substring(0, 63).replaceAll(/-+$/, '')
-    }}
-    if (!deploymentName?.trim()) {{
+    }
+    if (!deploymentName?.trim()) {
         error "deploymentName is required and must resolve to a valid Kubernetes deployment name"
-    }}
+    }
     def manifests = config.get('manifests', 'k8s/')
     def approval = config.get('approval', environment != 'dev')
 
-    if (approval) {{
-        stage("Approve Deploy to ${{environment}}") {{
-            input message: "Deploy to ${{environment}}?",
+    if (approval) {
+        stage("Approve Deploy to ${environment}") {
+            input message: "Deploy to ${environment}?",
                   ok: 'Deploy',
                   submitter: 'admin,ops-team'
-        }}
-    }}
+        }
+    }
 
-    stage("Deploy to ${{environment}}") {{
-        if (kubeConfig) {{
-            withCredentials([file(credentialsId: kubeConfig, variable: 'KUBECONFIG')]) {{
+    stage("Deploy to ${environment}") {
+        if (kubeConfig) {
+            withCredentials([file(credentialsId: kubeConfig, variable: 'KUBECONFIG')]) {
                 withEnv([
-                    "KUBE_NAMESPACE=${{namespace}}",
-                    "DEPLOYMENT_NAME=${{deploymentName}}",
-                    "MANIFESTS_PATH=${{manifests}}",
-                ]) {{
+                    "KUBE_NAMESPACE=${namespace}",
+                    "DEPLOYMENT_NAME=${deploymentName}",
+                    "MANIFESTS_PATH=${manifests}",
+                ]) {
                     sh(label: 'Deploy manifests', script: """
                         set -euo pipefail
                         kubectl apply -f "$MANIFESTS_PATH" -n "$KUBE_NAMESPACE"
                         kubectl rollout status "deployment/$DEPLOYMENT_NAME" -n "$KUBE_NAMESPACE" --timeout=300s
                     """)
-                }}
-            }}
-        }} else {{
+                }
+            }
+        } else {
             error "kubeConfig credential ID is required for deployment"
-        }}
-    }}
-}}
-'''
-        self._write_file("vars/deployApp.groovy", deploy_app_groovy)
-        self._write_file("vars/deployApp.txt", "Deploy application: deployApp(environment: 'staging', kubeConfig: 'kubeconfig-staging', namespace: 'myapp', deploymentName: 'myapp')")
+        }
+    }
+}
+''')
 
-        # dockerBuild.groovy - Docker build and push
-        docker_build_groovy = f'''/**
+_DOCKER_BUILD_GROOVY = _GroovyTemplate('''/**
  * Docker build and push function
  *
  * Usage:
- *   @Library('{self.name}') _
+ *   @Library('%name') _
  *   dockerBuild(
  *       imageName: 'myapp',
  *       registry: 'registry.example.com',
@@ -462,7 +422,7 @@ def call(Map config = [:]) {{
  *   )
  */
 
-def call(Map config = [:]) {{
+def call(Map config = [:]) {
     def imageName = config.get('imageName', env.JOB_NAME)
     def registry = config.get('registry')
     def credentialsId = config.get('credentialsId')
@@ -471,41 +431,38 @@ def call(Map config = [:]) {{
     def tags = config.get('tags', [env.BUILD_NUMBER, 'latest'])
     def push = config.get('push', true)
 
-    def fullImageName = registry ? "${{registry}}/${{imageName}}" : imageName
+    def fullImageName = registry ? "${registry}/${imageName}" : imageName
 
-    stage('Build Docker Image') {{
-        script {{
-            def image = docker.build("${{fullImageName}}:${{tags[0]}}", "-f ${{dockerfile}} ${{context}}")
+    stage('Build Docker Image') {
+        script {
+            def image = docker.build("${fullImageName}:${tags[0]}", "-f ${dockerfile} ${context}")
 
             // Tag with additional tags
-            tags.drop(1).each {{ tag ->
+            tags.drop(1).each { tag ->
                 image.tag(tag)
-            }}
+            }
 
-            if (push && registry && credentialsId) {{
-                stage('Push Docker Image') {{
-                    docker.withRegistry("https://${{registry}}", credentialsId) {{
-                        tags.each {{ tag ->
+            if (push && registry && credentialsId) {
+                stage('Push Docker Image') {
+                    docker.withRegistry("https://${registry}", credentialsId) {
+                        tags.each { tag ->
                             image.push(tag)
-                        }}
-                    }}
-                }}
-            }}
+                        }
+                    }
+                }
+            }
 
             return image
-        }}
-    }}
-}}
-'''
-        self._write_file("vars/dockerBuild.groovy", docker_build_groovy)
-        self._write_file("vars/dockerBuild.txt", "Docker build: dockerBuild(imageName: 'myapp', registry: 'registry.example.com', credentialsId: 'docker-creds')")
+        }
+    }
+}
+''')
 
-        # securityScan.groovy - Security scanning
-        security_scan_groovy = f'''/**
+_SECURITY_SCAN_GROOVY = _GroovyTemplate('''/**
  * Security scanning function
  *
  * Usage:
- *   @Library('{self.name}') _
+ *   @Library('%name') _
  *   securityScan(
  *       sonarqube: true,
  *       owaspDependencyCheck: true,
@@ -514,7 +471,7 @@ def call(Map config = [:]) {{
  *   )
  */
 
-def call(Map config = [:]) {{
+def call(Map config = [:]) {
     def sonarqube = config.get('sonarqube', false)
     def sonarqubeServer = config.get('sonarqubeServer', 'sonarqube-server')
     def owaspDependencyCheck = config.get('owaspDependencyCheck', false)
@@ -524,19 +481,19 @@ def call(Map config = [:]) {{
 
     def scanStages = [:]
 
-    if (sonarqube) {{
-        scanStages['SonarQube Analysis'] = {{
-            stage('SonarQube Analysis') {{
-                withSonarQubeEnv(sonarqubeServer) {{
+    if (sonarqube) {
+        scanStages['SonarQube Analysis'] = {
+            stage('SonarQube Analysis') {
+                withSonarQubeEnv(sonarqubeServer) {
                     sh 'mvn sonar:sonar'
-                }}
-            }}
-        }}
-    }}
-
-    if (owaspDependencyCheck) {{
-        scanStages['OWASP Dependency Check'] = {{
-            stage('OWASP Dependency Check') {{
+                }
+            }
+        }
+    }
+
+    if (owaspDependencyCheck) {
+        scanStages['OWASP Dependency Check'] = {
+            stage('OWASP Dependency Check') {
                 dependencyCheck(
                     additionalArguments: '--scan . --format HTML --format XML',
                     odcInstallation: 'OWASP-Dependency-Check'
@@ -545,45 +502,137 @@ def call(Map config = [:]) {{
                     pattern: 'dependency-check-report.xml',
                     failedTotalCritical: failOnCritical ? 0 : 999
                 )
-            }}
-        }}
-    }}
+            }
+        }
+    }
 
-    if (trivy && trivyImage) {{
-        scanStages['Trivy Container Scan'] = {{
-            stage('Trivy Container Scan') {{
+    if (trivy && trivyImage) {
+        scanStages['Trivy Container Scan'] = {
+            stage('Trivy Container Scan') {
                 def severityFlag = failOnCritical ? '--exit-code 1 --severity CRITICAL' : '--severity CRITICAL,HIGH'
                 sh """
                     docker run --rm \\
                         -v /var/run/docker.sock:/var/run/docker.sock \\
                         aquasec/trivy:latest image \\
-                        ${{severityFlag}} \\
+                        ${severityFlag} \\
                         --ignore-unfixed \\
-                        ${{trivyImage}}
+                        ${trivyImage}
                 """
-            }}
-        }}
-    }}
+            }
+        }
+    }
 
-    if (scanStages) {{
+    if (scanStages) {
         parallel scanStages
-    }}
+    }
 
-    if (sonarqube) {{
-        stage('Quality Gate') {{
-            timeout(time: 5, unit: 'MINUTES') {{
+    if (sonarqube) {
+        stage('Quality Gate') {
+            timeout(time: 5, unit: 'MINUTES') {
                 waitForQualityGate abortPipeline: true
-            }}
-        }}
-    }}
-}}
-'''
-        self._write_file("vars/securityScan.groovy", security_scan_groovy)
-        self._write_file("vars/securityScan.txt", "Security scanning: securityScan(sonarqube: true, owaspDependencyCheck: true, trivy: true, trivyImage: 'myapp:latest')")
+            }
+        }
+    }
+}
+''')
+# Global variables by name: (vars/<name>.groovy template, vars/<name>.txt summary,
+# README directory-tree comment, README usage section). Templates render only when
+# their name is requested via --vars, and the README lists only those names.
+_VARS_FILES = {
+    'log': (
+        _LOG_GROOVY,
+        "Logging utilities: log.info(), log.warning(), log.error(), log.success(), log.debug()",
+        'Logging utilities',
+        '''#### Logging
+
+```groovy
+log.info 'Starting build...'
+log.warning 'Deprecated feature used'
+log.error 'Build failed!'
+log.success 'Build completed!'
+log.debug 'Debug message (only shown when DEBUG=true)'
+```
+
+''',
+    ),
+    'buildApp': (
+        _BUILD_APP_GROOVY,
+        "Build application: buildApp(buildTool: 'maven', jdkVersion: 'JDK-21', skipTests: false)",
+        'Build function',
+        '''#### Build Application
+
+```groovy
+buildApp(
+    buildTool: 'maven',      // 'maven', 'gradle', or 'npm'
+    jdkVersion: 'JDK-21',
+    skipTests: false,
+    additionalArgs: ''
+)
+```
+
+''',
+    ),
+    'deployApp': (
+        _DEPLOY_APP_GROOVY,
+        "Deploy application: deployApp(environment: 'staging', kubeConfig: 'kubeconfig-staging', namespace: 'myapp', deploymentName: 'myapp')",
+        'Deployment function',
+        '''#### Deploy Application
+
+```groovy
+deployApp(
+    environment: 'staging',
+    kubeConfig: 'kubeconfig-staging',
+    namespace: 'myapp-staging',
+    manifests: 'k8s/',
+    approval: true
+)
+```
+
+''',
+    ),
+    'dockerBuild': (
+        _DOCKER_BUILD_GROOVY,
+        "Docker build: dockerBuild(imageName: 'myapp', registry: 'registry.example.com', credentialsId: 'docker-creds')",
+        'Docker build/push',
+        '''#### Docker Build and Push
+
+```groovy
+dockerBuild(
+    imageName: 'myapp',
+    registry: 'registry.example.com',
+    credentialsId: 'docker-registry-creds',
+    dockerfile: 'Dockerfile',
+    context: '.',
+    tags: [env.BUILD_NUMBER, 'latest'],
+    push: true
+)
+```
+
+''',
+    ),
+    'securityScan': (
+        _SECURITY_SCAN_GROOVY,
+        "Security scanning: securityScan(sonarqube: true, owaspDependencyCheck: true, trivy: true, trivyImage: 'myapp:latest')",
+        'Security scanning',
+        '''#### Security Scanning
+
+```groovy
+securityScan(
+    sonarqube: true,
+    sonarqubeServer: 'sonarqube-server',
+    owaspDependencyCheck: true,
+    trivy: true,
+    trivyImage: 'myapp:latest',
+    failOnCritical: true
+)
+```
 
-    def _generate_resources(self):
-        """Generate resources/ files"""
-        config_json = '''{
+''',
+    ),
+}
+
+# resources/ and top-level files
+_CONFIG_JSON = '''{
     "environments": {
         "dev": {
             "namespace": "dev",
@@ -608,33 +657,26 @@ def call(Map config = [:]) {{
     }
 }
 '''
-        self._write_file(f"resources/{self.package_path}/config.json", config_json)
 
-    def _generate_readme(self):
-        """Generate README.md"""
-        readme = f'''# {self.name}
+_README_MD = _GroovyTemplate('''# %name
 
 Jenkins Shared Library for CI/CD pipelines.
 
-Generated: {self.timestamp}
+Generated: %timestamp
 
 ## Directory Structure
 
 ```
-{self.name}/
+%name/
 ├── src/                          # Groovy source files (classes)
-│   └── {self.package_path}/
+│   └── %package_path/
 │       ├── Utils.groovy          # Utility class
 │       ├── Docker.groovy         # Docker operations
 │       └── Notifications.groovy  # Notification utilities
 ├── vars/                         # Global pipeline variables
-│   ├── log.groovy                # Logging utilities
-│   ├── buildApp.groovy           # Build function
-│   ├── deployApp.groovy          # Deployment function
-│   ├── dockerBuild.groovy        # Docker build/push
-│   └── securityScan.groovy       # Security scanning
+%vars_tree
 ├── resources/                    # Resource files
-│   └── {self.package_path}/
+│   └── %package_path/
 │       └── config.json           # Configuration data
 └── README.md
 ```
@@ -645,7 +687,7 @@ Generated: {self.timestamp}
 
 1. Go to **Manage Jenkins** → **System Configuration** → **Global Pipeline Libraries**
 2. Add a new library:
-   - **Name**: `{self.name}`
+   - **Name**: `%name`
    - **Default version**: `main`
    - **Retrieval method**: Modern SCM → Git
    - **Project Repository**: `<your-git-repo-url>`
@@ -654,7 +696,7 @@ Generated: {self.timestamp}
 
 ```groovy
 // Jenkinsfile
-library identifier: '{self.name}@main', retriever: modernSCM([
+library identifier: '%name@main', retriever: modernSCM([
     $class: 'GitSCMSource',
     remote: '<your-git-repo-url>',
     credentialsId: 'git-credentials'
@@ -666,97 +708,35 @@ library identifier: '{self.name}@main', retriever: modernSCM([
 ### Import the Library
 
 ```groovy
-@Library('{self.name}') _
+@Library('%name') _
 ```
 
 Or with a specific version:
 
 ```groovy
-@Library('{self.name}@v1.0.0') _
-```
-
-### Available Functions
-
-#### Logging
-
-```groovy
-log.info 'Starting build...'
-log.warning 'Deprecated feature used'
-log.error 'Build failed!'
-log.success 'Build completed!'
-log.debug 'Debug message (only shown when DEBUG=true)'
-```
-
-#### Build Application
-
-```groovy
-buildApp(
-    buildTool: 'maven',      // 'maven', 'gradle', or 'npm'
-    jdkVersion: 'JDK-21',
-    skipTests: false,
-    additionalArgs: ''
-)
-```
-
-#### Deploy Application
-
-```groovy
-deployApp(
-    environment: 'staging',
-    kubeConfig: 'kubeconfig-staging',
-    namespace: 'myapp-staging',
-    manifests: 'k8s/',
-    approval: true
-)
-```
-
-#### Docker Build and Push
-
-```groovy
-dockerBuild(
-    imageName: 'myapp',
-    registry: 'registry.example.com',
-    credentialsId: 'docker-registry-creds',
-    dockerfile: 'Dockerfile',
-    context: '.',
-    tags: [env.BUILD_NUMBER, 'latest'],
-    push: true
-)
-```
-
-#### Security Scanning
-
-```groovy
-securityScan(
-    sonarqube: true,
-    sonarqubeServer: 'sonarqube-server',
-    owaspDependencyCheck: true,
-    trivy: true,
-    trivyImage: 'myapp:latest',
-    failOnCritical: true
-)
+@Library('%name@v1.0.0') _
 ```
 
-### Using Classes
+%vars_usage### Using Classes
 
 ```groovy
-@Library('{self.name}') _
-import {self.package}.Utils
-import {self.package}.Docker
-import {self.package}.Notifications
+@Library('%name') _
+import %package.Utils
+import %package.Docker
+import %package.Notifications
 
-pipeline {{
+pipeline {
     agent any
 
-    stages {{
-        stage('Example') {{
-            steps {{
-                script {{
+    stages {
+        stage('Example') {
+            steps {
+                script {
                     // Use utility functions
                     def branch = Utils.getBranchName(this)
                     def sha = Utils.getShortCommitSha(this)
 
-                    echo "Building ${{branch}} at ${{sha}}"
+                    echo "Building ${branch} at ${sha}"
 
                     // Use Docker class
                     def docker = new Docker(this, 'registry.example.com', 'docker-creds')
@@ -765,34 +745,34 @@ pipeline {{
 
                     // Use Notifications
                     def notify = new Notifications(this)
-                    notify.slack('#builds', "Build completed: ${{sha}}")
-                }}
-            }}
-        }}
-    }}
-}}
+                    notify.slack('#builds', "Build completed: ${sha}")
+                }
+            }
+        }
+    }
+}
 ```
 
 ### Loading Resources
 
 ```groovy
-@Library('{self.name}') _
+@Library('%name') _
 
-pipeline {{
+pipeline {
     agent any
 
-    stages {{
-        stage('Load Config') {{
-            steps {{
-                script {{
-                    def config = libraryResource '{self.package_path}/config.json'
+    stages {
+        stage('Load Config') {
+            steps {
+                script {
+                    def config = libraryResource '%package_path/config.json'
                     def configMap = readJSON text: config
-                    echo "Production replicas: ${{configMap.environments.production.replicas}}"
-                }}
-            }}
-        }}
-    }}
-}}
+                    echo "Production replicas: ${configMap.environments.production.replicas}"
+                }
+            }
+        }
+    }
+}
 ```
 
 ## Testing
@@ -811,16 +791,121 @@ See [Jenkins Pipeline Unit Testing Framework](https://github.com/jenkinsci/Jenki
 ## License
 
 MIT License
-'''
-        self._write_file("README.md", readme)
+''')
+
+
+@functools.lru_cache(maxsize=32)
+def _render_src_files(package, timestamp):
+    """Render the src/ classes, which depend only on package and date.
+
+    Cached separately from _render_all so that libraries sharing a package,
+    typically the default org.example, reuse one encoded copy of the classes.
+    """
+    package_path = package.replace('.', '/')
+    files = []
+    for cls, description, body in _SRC_CLASSES:
+        header = _CLASS_HEADER.substitute(
+            package=package, description=description, cls=cls, timestamp=timestamp
+        )
+        files.append((f"src/{package_path}/{cls}.groovy", (header + body).encode('utf-8')))
+    return tuple(files)
+
+
+@functools.lru_cache(maxsize=32)
+def _render_all(name, package, timestamp, var_names):
+    """Render every library file for the given inputs.
+
+    var_names is a tuple of _VARS_FILES keys; only those vars/ files are
+    rendered. Returns a tuple of (relative_path, data) pairs in write order,
+    with data already encoded as UTF-8. The result is cached, so repeated
+    generation with the same inputs only repeats the disk I/O.
+    """
+    package_path = package.replace('.', '/')
+    fields = {
+        'name': name,
+        'package': package,
+        'package_path': package_path,
+        'timestamp': timestamp,
+    }
+    files = []
+    tree_lines = []
+    usage_sections = []
+    for index, var_name in enumerate(var_names):
+        template, summary, tree_comment, usage = _VARS_FILES[var_name]
+        files.append((f"vars/{var_name}.groovy", template.substitute(fields)))
+        files.append((f"vars/{var_name}.txt", summary))
+        branch = '└──' if index == len(var_names) - 1 else '├──'
+        tree_lines.append(f"│   {branch} {var_name + '.groovy':<26}# {tree_comment}")
+        usage_sections.append(usage)
+    fields['vars_tree'] = '\n'.join(tree_lines)
+    fields['vars_usage'] = '### Available Functions\n\n' + ''.join(usage_sections)
+    files.append((f"resources/{package_path}/config.json", _CONFIG_JSON))
+    files.append(("README.md", _README_MD.substitute(fields)))
+    return _render_src_files(package, timestamp) + tuple(
+        (path, content.encode('utf-8')) for path, content in files
+    )
 
-    def _write_file(self, relative_path, content):
-        """Write content to a file"""
-        file_path = os.path.join(self.output_dir, relative_path)
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
-        print(f"  Created: {relative_path}")
+
+class SharedLibraryGenerator:
+    """Generates Jenkins Shared Library scaffolding"""
+
+    def __init__(self, name, package='org.example', output_dir='.', global_vars=None):
+        if global_vars is None:
+            global_vars = _VARS_FILES
+        unknown = sorted(set(global_vars) - _VARS_FILES.keys())
+        if unknown:
+            raise ValueError(
+                f"Unknown global variable(s): {', '.join(unknown)}. "
+                f"Available: {', '.join(_VARS_FILES)}"
+            )
+        selected = tuple(var_name for var_name in _VARS_FILES if var_name in global_vars)
+        if not selected:
+            raise ValueError(
+                f"At least one global variable must be selected. Available: {', '.join(_VARS_FILES)}"
+            )
+        self.name = name
+        self.package = package
+        self.package_path = package.replace('.', '/')
+        self.output_dir = os.path.join(output_dir, name)
+        self._prefix = os.path.join(self.output_dir, '')
+        self.timestamp = _TODAY
+        self.global_vars = selected
+        self._known_dirs = set()
+        self._created = []
+
+    def generate(self):
+        """Generate the complete shared library structure"""
+        self._create_directory_structure()
+        for relative_path, data in _render_all(self.name, self.package, self.timestamp, self.global_vars):
+            self._write_file(relative_path, data)
+        lines = [f"  Created: {path}" for path in self._created]
+        lines.append(f"Shared library '{self.name}' generated at: {self.output_dir}")
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+    def _create_directory_structure(self):
+        """Create the directory structure"""
+        dirs = [
+            f"src/{self.package_path}",
+            "vars",
+            f"resources/{self.package_path}",
+            "test/groovy",
+        ]
+        for dir_path in dirs:
+            self._ensure_dir(self._prefix + dir_path)
+
+    def _ensure_dir(self, path):
+        """Create a directory once; later calls for the same path are no-ops"""
+        if path not in self._known_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._known_dirs.add(path)
+
+    def _write_file(self, relative_path, data):
+        """Write encoded data to a file"""
+        file_path = self._prefix + relative_path
+        self._ensure_dir(os.path.dirname(file_path))
+        FormattingHelpers.write_bytes(file_path, data)
+        self._created.append(relative_path)
 
 
 def main():
@@ -832,6 +917,7 @@ Examples:
     %(prog)s --name my-jenkins-library
     %(prog)s --name my-jenkins-library --package com.mycompany.jenkins
     %(prog)s --name my-jenkins-library --output ./output
+    %(prog)s --name my-jenkins-library --vars log,buildApp
         '''
     )
     parser.add_argument(
@@ -849,16 +935,27 @@ Examples:
         default='.',
         help='Output directory (default: current directory)'
     )
+    parser.add_argument(
+        '--vars',
+        default=','.join(_VARS_FILES),
+        help=f"Comma-separated vars/ global variables to generate (default: {','.join(_VARS_FILES)})"
+    )
 
     args = parser.parse_args()
 
-    generator = SharedLibraryGenerator(
-        name=args.name,
-        package=args.package,
-        output_dir=args.output
-    )
+    try:
+        generator = SharedLibraryGenerator(
+            name=args.name,
+            package=args.package,
+            output_dir=args.output,
+            global_vars=[var_name for var_name in map(str.strip, args.vars.split(',')) if var_name]
+        )
+    except ValueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 2
     generator.generate()
+    return 0
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
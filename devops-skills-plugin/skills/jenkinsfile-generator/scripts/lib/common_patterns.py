@@ -2,6 +2,8 @@
 Common Jenkins pipeline patterns and templates
 """
 
+import functools
+
 try:
     from .syntax_helpers import GroovySyntax, ValidationHelpers
 except ImportError:
@@ -12,8 +14,12 @@ class PipelinePatterns:
     """Common pipeline pattern templates"""
 
     @staticmethod
+    @functools.lru_cache(maxsize=8)
     def ci_pattern(build_tool='maven'):
-        """Standard CI pattern: checkout -> build -> test -> archive"""
+        """Standard CI pattern: checkout -> build -> test -> archive
+
+        Results are cached per build tool; treat the returned dict as read-only.
+        """
         patterns = {
             'maven': {
                 'build_cmd': 'mvn clean compile',
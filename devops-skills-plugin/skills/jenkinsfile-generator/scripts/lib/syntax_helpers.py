@@ -2,7 +2,9 @@
 Helper functions for generating proper Groovy/Jenkins syntax
 """
 
+import os
 import re
+from pathlib import Path
 from typing import List, Dict, Optional
 
 
@@ -486,6 +488,12 @@ class ValidationHelpers:
 class FormattingHelpers:
     """Helper functions for formatting output"""
 
+    # Layout fixes applied by format_jenkinsfile, compiled once
+    _EXCESS_BLANK_LINES = re.compile(r'\n{3,}')
+    _BLANK_AFTER_OPEN_BRACE = re.compile(r'{\n\n(\s*)')
+    _BLANK_BEFORE_CLOSE_BRACE = re.compile(r'\n\n(\s*})')
+    _BLOCK_FOLLOWED_BY_TEXT = re.compile(r'}\n([a-zA-Z])')
+
     @staticmethod
     def add_header_comment(content: str, description: str = "Generated Jenkinsfile") -> str:
         """Add header comment to Jenkinsfile"""
@@ -513,11 +521,32 @@ class FormattingHelpers:
     def format_jenkinsfile(content: str) -> str:
         """Format Jenkinsfile with proper indentation and spacing"""
         # Remove excessive blank lines (3+ newlines -> 2 newlines)
-        content = re.sub(r'\n{3,}', '\n\n', content)
+        content = FormattingHelpers._EXCESS_BLANK_LINES.sub('\n\n', content)
         # Remove blank lines after opening braces
-        content = re.sub(r'{\n\n(\s*)', r'{\n\1', content)
+        content = FormattingHelpers._BLANK_AFTER_OPEN_BRACE.sub(r'{\n\1', content)
         # Remove blank lines before closing braces
-        content = re.sub(r'\n\n(\s*})', r'\n\1', content)
+        content = FormattingHelpers._BLANK_BEFORE_CLOSE_BRACE.sub(r'\n\1', content)
         # Ensure proper spacing around blocks
-        content = re.sub(r'}\n([a-zA-Z])', r'}\n\n\1', content)
+        content = FormattingHelpers._BLOCK_FOLLOWED_BY_TEXT.sub(r'}\n\n\1', content)
         return content.strip() + '\n'
+
+    @staticmethod
+    def write_jenkinsfile(output_path: Path, content: str) -> None:
+        """Write content to output_path as UTF-8 via write_bytes"""
+        FormattingHelpers.write_bytes(output_path, content.encode('utf-8'))
+
+    @staticmethod
+    def write_bytes(output_path, data: bytes) -> None:
+        """Write data to output_path in a single drained write.
+
+        The file is opened in place, so symlinks are written through and an
+        existing file keeps its mode; new files get 0o666 minus the umask.
+        Every generator writes its output through here.
+        """
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
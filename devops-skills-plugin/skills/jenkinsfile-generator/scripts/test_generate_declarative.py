@@ -2,6 +2,7 @@
 """Regression tests for generate_declarative.py behavior."""
 
 from pathlib import Path
+import stat
 import sys
 import tempfile
 import unittest
@@ -9,10 +10,9 @@ import unittest
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 sys.path.insert(0, str(SCRIPT_DIR))
-sys.path.insert(0, str(SCRIPT_DIR / "lib"))
 
 from generate_declarative import DeclarativePipelineGenerator, resolve_k8s_yaml  # noqa: E402
-from syntax_helpers import ValidationHelpers  # noqa: E402
+from lib.syntax_helpers import FormattingHelpers, ValidationHelpers  # noqa: E402
 
 
 class ResolveK8sYamlRegressionTests(unittest.TestCase):
@@ -47,6 +47,34 @@ class ResolveK8sYamlRegressionTests(unittest.TestCase):
         self.assertEqual(resolve_k8s_yaml(inline_yaml), inline_yaml)
 
 
+class WriteJenkinsfileTests(unittest.TestCase):
+    """Output is written as UTF-8 in place over any existing file."""
+
+    def test_replaces_existing_file_without_leftovers(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / "Jenkinsfile"
+            output_path.write_text("stale content that is longer\n", encoding="utf-8")
+
+            FormattingHelpers.write_jenkinsfile(output_path, "pipeline { // caf\u00e9 }\n")
+
+            self.assertEqual(output_path.read_text(encoding="utf-8"), "pipeline { // caf\u00e9 }\n")
+            self.assertEqual([p.name for p in Path(temp_dir).iterdir()], ["Jenkinsfile"])
+
+    def test_writes_through_symlink_and_keeps_mode(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "real-Jenkinsfile"
+            target.write_text("old\n", encoding="utf-8")
+            target.chmod(0o600)
+            link = Path(temp_dir) / "Jenkinsfile"
+            link.symlink_to(target)
+
+            FormattingHelpers.write_jenkinsfile(link, "pipeline {}\n")
+
+            self.assertTrue(link.is_symlink())
+            self.assertEqual(target.read_text(encoding="utf-8"), "pipeline {}\n")
+            self.assertEqual(stat.S_IMODE(target.stat().st_mode), 0o600)
+
+
 class StageListParsingRegressionTests(unittest.TestCase):
     """Lock stage key normalization and validation rules."""
 
@@ -57,5 +57,52 @@ class SharedLibraryDeployTemplateRegressionTests(unittest.TestCase):
         self.assertNotIn("deployment/${deploymentName}", text)
 
 
+class SharedLibraryVarsSelectionTests(unittest.TestCase):
+    """Ensure only the requested vars/ helpers are generated."""
+
+    def test_generates_only_requested_vars(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            generator = SharedLibraryGenerator(
+                name="example-lib",
+                output_dir=temp_dir,
+                global_vars=["buildApp", "log"],
+            )
+            generator.generate()
+            vars_dir = Path(temp_dir) / "example-lib" / "vars"
+            generated = sorted(path.name for path in vars_dir.iterdir())
+
+        self.assertEqual(
+            generated,
+            ["buildApp.groovy", "buildApp.txt", "log.groovy", "log.txt"],
+        )
+
+    def test_readme_mentions_only_requested_vars(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            generator = SharedLibraryGenerator(
+                name="example-lib",
+                output_dir=temp_dir,
+                global_vars=["log", "deployApp"],
+            )
+            generator.generate()
+            readme = (Path(temp_dir) / "example-lib" / "README.md").read_text(encoding="utf-8")
+
+        self.assertIn("│   ├── log.groovy", readme)
+        self.assertIn("│   └── deployApp.groovy", readme)
+        self.assertIn("#### Deploy Application", readme)
+        for omitted in ("buildApp", "dockerBuild", "securityScan"):
+            self.assertNotIn(omitted, readme)
+
+    def test_unknown_var_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "Unknown global variable"):
+            SharedLibraryGenerator(name="example-lib", global_vars=["nope"])
+
+
+    def test_empty_selection_is_rejected(self):
+        for global_vars in ([], ()):
+            with self.subTest(global_vars=global_vars):
+                with self.assertRaisesRegex(ValueError, "At least one global variable"):
+                    SharedLibraryGenerator(name="example-lib", global_vars=global_vars)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -6,19 +6,264 @@ Extracts kind, apiVersion, and group information for CRD documentation lookup.
 This script is resilient to syntax errors in individual documents within
 multi-document YAML files. It will parse valid documents and report errors
 for invalid ones, allowing CRD detection to proceed for parseable resources.
+
+Several files may be passed at once; they are parsed in parallel and the
+merged result tags each resource and parse error with its source file.
 """
 
 import json
+import os
 import re
 import sys
 from pathlib import Path
 
-try:
-    import yaml
-except ImportError:
-    print("Error: PyYAML is not installed. Please run: pip install pyyaml", file=sys.stderr)
-    print("Or use the wrapper script: bash scripts/detect_crd_wrapper.sh", file=sys.stderr)
-    sys.exit(1)
+# PyYAML is imported on first use (see _import_yaml) so usage errors and
+# missing files are reported without paying for the import
+yaml = None
+SafeLoader = None
+_plain_scalar_tag = None
+
+
+def _import_yaml():
+    """Import PyYAML once, exiting with install hints when it is missing."""
+    global yaml, SafeLoader, _plain_scalar_tag
+    if yaml is not None:
+        return
+
+    try:
+        import yaml
+    except ImportError:
+        print("Error: PyYAML is not installed. Please run: pip install pyyaml", file=sys.stderr)
+        print("(install the libyaml system package first, e.g. libyaml-dev, to get the faster C loader)",
+              file=sys.stderr)
+        print("Or use the wrapper script: bash scripts/detect_crd_wrapper.sh", file=sys.stderr)
+        sys.exit(1)
+
+    # Prefer the libyaml-backed loader; fall back to the pure-Python one when
+    # PyYAML was built without libyaml. Both construct identical Python objects.
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+
+    from yaml.nodes import ScalarNode
+    from yaml.resolver import Resolver
+    resolve = Resolver().resolve
+
+    def _plain_scalar_tag(value):
+        return resolve(ScalarNode, value, (True, False))
+
+
+# apiVersions served by Kubernetes itself; anything else is treated as a CRD
+STANDARD_API_VERSIONS = frozenset({
+    # Core API group
+    'v1',
+    # Apps group
+    'apps/v1',
+    # Batch group
+    'batch/v1',
+    'batch/v1beta1',
+    # Networking group
+    'networking.k8s.io/v1',
+    'networking.k8s.io/v1beta1',
+    # Policy group
+    'policy/v1',
+    'policy/v1beta1',
+    # RBAC group
+    'rbac.authorization.k8s.io/v1',
+    'rbac.authorization.k8s.io/v1beta1',
+    # Storage group
+    'storage.k8s.io/v1',
+    'storage.k8s.io/v1beta1',
+    # Autoscaling group
+    'autoscaling/v1',
+    'autoscaling/v2',
+    'autoscaling/v2beta1',
+    'autoscaling/v2beta2',
+    # API Extensions group (for CRD definitions themselves)
+    'apiextensions.k8s.io/v1',
+    'apiextensions.k8s.io/v1beta1',
+    # Certificates group
+    'certificates.k8s.io/v1',
+    'certificates.k8s.io/v1beta1',
+    # Admission Registration group
+    'admissionregistration.k8s.io/v1',
+    'admissionregistration.k8s.io/v1beta1',
+    # Coordination group (Leases)
+    'coordination.k8s.io/v1',
+    # Discovery group (EndpointSlices)
+    'discovery.k8s.io/v1',
+    'discovery.k8s.io/v1beta1',
+    # Events group
+    'events.k8s.io/v1',
+    'events.k8s.io/v1beta1',
+    # Flow Control group (v1 is GA since K8s 1.29, v1beta3 deprecated in 1.32)
+    'flowcontrol.apiserver.k8s.io/v1',
+    'flowcontrol.apiserver.k8s.io/v1beta1',
+    'flowcontrol.apiserver.k8s.io/v1beta2',
+    'flowcontrol.apiserver.k8s.io/v1beta3',
+    # Storage Migration group (K8s 1.30+)
+    'storagemigration.k8s.io/v1alpha1',
+    # Node group (RuntimeClass)
+    'node.k8s.io/v1',
+    'node.k8s.io/v1beta1',
+    # Scheduling group (PriorityClass)
+    'scheduling.k8s.io/v1',
+    'scheduling.k8s.io/v1beta1',
+    # Snapshot Storage group (VolumeSnapshots)
+    'snapshot.storage.k8s.io/v1',
+    'snapshot.storage.k8s.io/v1beta1',
+    # Networking alpha (AdminNetworkPolicy - K8s 1.30+)
+    'networking.k8s.io/v1alpha1',
+    # Certificates alpha (ClusterTrustBundle - K8s 1.30+)
+    'certificates.k8s.io/v1alpha1',
+    # Resource group (ResourceClaims - K8s 1.26+)
+    'resource.k8s.io/v1alpha2',
+    'resource.k8s.io/v1alpha3',
+    # Internal API Server group
+    'internal.apiserver.k8s.io/v1alpha1',
+    # API Registration group
+    'apiregistration.k8s.io/v1',
+    'apiregistration.k8s.io/v1beta1',
+    # Authentication group
+    'authentication.k8s.io/v1',
+    'authentication.k8s.io/v1beta1',
+    # Authorization group
+    'authorization.k8s.io/v1',
+    'authorization.k8s.io/v1beta1',
+})
+
+# Standard API groups outside the *.k8s.io namespace (apps, batch, ...)
+_PLAIN_STANDARD_GROUPS = frozenset(
+    group for group, _, _ in (v.rpartition('/') for v in STANDARD_API_VERSIONS)
+    if group and not group.endswith('.k8s.io')
+)
+
+
+# Top-level keys the event scanner captures; every other subtree is skipped
+RESOURCE_KEYS = frozenset({'kind', 'apiVersion', 'metadata'})
+
+_STR_TAG = 'tag:yaml.org,2002:str'
+_NULL_TAG = 'tag:yaml.org,2002:null'
+
+
+class _NeedsFullLoad(Exception):
+    """Raised when a document uses YAML features the event scanner does not model."""
+
+
+def _scalar_value(event):
+    """Return a scalar event's value as the safe loader would build it (str or None)."""
+    if not event.implicit[0]:
+        return event.value
+    tag = _plain_scalar_tag(event.value)
+    if tag == _STR_TAG:
+        return event.value
+    if tag == _NULL_TAG:
+        return None
+    raise _NeedsFullLoad
+
+
+def scan_resource_documents(raw):
+    """
+    Scan YAML parser events and keep only kind, apiVersion and metadata.name.
+
+    Every non-empty document yields a small dict shaped like the loaded
+    document (non-mapping documents yield an empty dict), so the result can be
+    fed to extract_resource_info() without constructing the spec subtrees.
+
+    Raises:
+        _NeedsFullLoad: when a document relies on tags, merge keys, complex
+            keys or aliases in captured fields; load the file normally then.
+        yaml.YAMLError: on syntax errors.
+    """
+    _import_yaml()
+    from yaml.events import (
+        AliasEvent, DocumentEndEvent, DocumentStartEvent, MappingEndEvent,
+        MappingStartEvent, ScalarEvent, SequenceEndEvent, SequenceStartEvent,
+    )
+
+    documents = []
+    anchors = set()
+    # One [is_mapping, expecting_key, key, role] entry per open collection;
+    # role is 'root' or 'metadata' for captured mappings, None when skipped
+    stack = []
+    doc = None
+
+    for event in yaml.parse(raw, Loader=SafeLoader):
+        cls = event.__class__
+        if cls is MappingEndEvent or cls is SequenceEndEvent:
+            stack.pop()
+            if stack and stack[-1][0]:
+                stack[-1][1] = True
+            continue
+        if cls is DocumentStartEvent:
+            doc = None
+            anchors.clear()
+            continue
+        if cls is DocumentEndEvent:
+            if doc is not None:
+                documents.append(doc)
+            continue
+        if cls is not AliasEvent and cls is not ScalarEvent \
+                and cls is not MappingStartEvent and cls is not SequenceStartEvent:
+            continue  # StreamStartEvent / StreamEndEvent
+
+        if cls is AliasEvent:
+            if event.anchor not in anchors:
+                raise _NeedsFullLoad
+        else:
+            if event.tag is not None and event.tag != '!':
+                raise _NeedsFullLoad
+            if event.anchor is not None:
+                if event.anchor in anchors:
+                    raise _NeedsFullLoad
+                anchors.add(event.anchor)
+
+        if not stack:
+            # Document root; a bare '---' or 'null' document is dropped
+            if cls is ScalarEvent:
+                if not (event.implicit[0] and _plain_scalar_tag(event.value) == _NULL_TAG):
+                    doc = {}
+            else:
+                doc = {}
+                stack.append([cls is MappingStartEvent, True, None,
+                              'root' if cls is MappingStartEvent else None])
+            continue
+
+        parent = stack[-1]
+        is_mapping, expecting_key, key, role = parent
+        if is_mapping and expecting_key:
+            # Only plain scalar keys are hashable without a full load
+            if cls is not ScalarEvent or (event.value == '<<' and event.implicit[0]):
+                raise _NeedsFullLoad
+            parent[1] = False
+            parent[2] = event.value
+            continue
+
+        if role == 'root' and key in RESOURCE_KEYS:
+            if cls is ScalarEvent:
+                value = _scalar_value(event)
+                if key == 'metadata' and value is not None:
+                    raise _NeedsFullLoad
+                doc[key] = value
+            elif key == 'metadata' and cls is MappingStartEvent:
+                doc['metadata'] = {}
+                stack.append([True, True, None, 'metadata'])
+                continue
+            else:
+                raise _NeedsFullLoad
+        elif role == 'metadata' and key == 'name':
+            if cls is not ScalarEvent:
+                raise _NeedsFullLoad
+            doc['metadata']['name'] = _scalar_value(event)
+        elif cls is MappingStartEvent or cls is SequenceStartEvent:
+            stack.append([cls is MappingStartEvent, True, None, None])
+            continue
+
+        if is_mapping:
+            parent[1] = True
+
+    return documents
 
 
 def _has_yaml_content(content: str) -> bool:
@@ -80,31 +325,43 @@ def parse_yaml_file(file_path):
     Returns:
         tuple: (list of parsed documents, list of parse errors)
     """
+    _import_yaml()
     try:
-        with open(file_path, 'r') as f:
-            content = f.read()
+        # Raw bytes go straight to the loader, which detects the encoding itself
+        with open(file_path, 'rb') as f:
+            raw = f.read()
     except Exception as e:
         print(f"Error reading file: {e}", file=sys.stderr)
         return [], [{'error': str(e), 'document': 0}]
 
-    # First, try parsing the entire file at once (fast path).
-    # Filter out None documents produced by bare '---' separators so that
-    # totalDocuments is consistent with count_yaml_documents.py.
+    # First, try parsing the entire file at once (fast path). The event
+    # scanner only builds the fields detection needs; files it cannot model
+    # are loaded in full. Filter out None documents produced by bare '---'
+    # separators so that totalDocuments is consistent with
+    # count_yaml_documents.py.
     try:
-        documents = [d for d in yaml.safe_load_all(content) if d is not None]
-        return documents, []
+        try:
+            return scan_resource_documents(raw), []
+        except _NeedsFullLoad:
+            documents = [d for d in yaml.load_all(raw, Loader=SafeLoader) if d is not None]
+            return documents, []
     except yaml.YAMLError:
         # If full parsing fails, try document-by-document parsing
         pass
 
     # Split into individual documents and parse each separately
+    try:
+        content = raw.decode('utf-8')
+    except UnicodeDecodeError as e:
+        print(f"Error reading file: {e}", file=sys.stderr)
+        return [], [{'error': str(e), 'document': 0}]
     doc_parts = split_yaml_documents(content)
     documents = []
     errors = []
 
     for i, doc_info in enumerate(doc_parts, 1):
         try:
-            parsed = yaml.safe_load(doc_info['content'])
+            parsed = yaml.load(doc_info['content'], Loader=SafeLoader)
             if parsed is not None:
                 documents.append(parsed)
         except yaml.YAMLError as e:
@@ -129,88 +386,19 @@ def parse_yaml_file(file_path):
     return documents, errors
 
 
-def is_standard_k8s_resource(api_version, kind):
+def is_standard_k8s_resource(api_version):
     """Check if a resource is a standard Kubernetes resource."""
-    standard_groups = {
-        # Core API group
-        'v1': True,
-        # Apps group
-        'apps/v1': True,
-        # Batch group
-        'batch/v1': True,
-        'batch/v1beta1': True,
-        # Networking group
-        'networking.k8s.io/v1': True,
-        'networking.k8s.io/v1beta1': True,
-        # Policy group
-        'policy/v1': True,
-        'policy/v1beta1': True,
-        # RBAC group
-        'rbac.authorization.k8s.io/v1': True,
-        'rbac.authorization.k8s.io/v1beta1': True,
-        # Storage group
-        'storage.k8s.io/v1': True,
-        'storage.k8s.io/v1beta1': True,
-        # Autoscaling group
-        'autoscaling/v1': True,
-        'autoscaling/v2': True,
-        'autoscaling/v2beta1': True,
-        'autoscaling/v2beta2': True,
-        # API Extensions group (for CRD definitions themselves)
-        'apiextensions.k8s.io/v1': True,
-        'apiextensions.k8s.io/v1beta1': True,
-        # Certificates group
-        'certificates.k8s.io/v1': True,
-        'certificates.k8s.io/v1beta1': True,
-        # Admission Registration group
-        'admissionregistration.k8s.io/v1': True,
-        'admissionregistration.k8s.io/v1beta1': True,
-        # Coordination group (Leases)
-        'coordination.k8s.io/v1': True,
-        # Discovery group (EndpointSlices)
-        'discovery.k8s.io/v1': True,
-        'discovery.k8s.io/v1beta1': True,
-        # Events group
-        'events.k8s.io/v1': True,
-        'events.k8s.io/v1beta1': True,
-        # Flow Control group (v1 is GA since K8s 1.29, v1beta3 deprecated in 1.32)
-        'flowcontrol.apiserver.k8s.io/v1': True,
-        'flowcontrol.apiserver.k8s.io/v1beta1': True,
-        'flowcontrol.apiserver.k8s.io/v1beta2': True,
-        'flowcontrol.apiserver.k8s.io/v1beta3': True,
-        # Storage Migration group (K8s 1.30+)
-        'storagemigration.k8s.io/v1alpha1': True,
-        # Node group (RuntimeClass)
-        'node.k8s.io/v1': True,
-        'node.k8s.io/v1beta1': True,
-        # Scheduling group (PriorityClass)
-        'scheduling.k8s.io/v1': True,
-        'scheduling.k8s.io/v1beta1': True,
-        # Snapshot Storage group (VolumeSnapshots)
-        'snapshot.storage.k8s.io/v1': True,
-        'snapshot.storage.k8s.io/v1beta1': True,
-        # Networking alpha (AdminNetworkPolicy - K8s 1.30+)
-        'networking.k8s.io/v1alpha1': True,
-        # Certificates alpha (ClusterTrustBundle - K8s 1.30+)
-        'certificates.k8s.io/v1alpha1': True,
-        # Resource group (ResourceClaims - K8s 1.26+)
-        'resource.k8s.io/v1alpha2': True,
-        'resource.k8s.io/v1alpha3': True,
-        # Internal API Server group
-        'internal.apiserver.k8s.io/v1alpha1': True,
-        # API Registration group
-        'apiregistration.k8s.io/v1': True,
-        'apiregistration.k8s.io/v1beta1': True,
-        # Authentication group
-        'authentication.k8s.io/v1': True,
-        'authentication.k8s.io/v1beta1': True,
-        # Authorization group
-        'authorization.k8s.io/v1': True,
-        'authorization.k8s.io/v1beta1': True,
-    }
+    # Most CRD groups (cert-manager.io, argoproj.io, ...) are rejected by the
+    # group alone, before hashing the full apiVersion
+    group = api_version.rpartition('/')[0]
+    if group and not (group.endswith('.k8s.io') or group in _PLAIN_STANDARD_GROUPS):
+        return False
+    return api_version in STANDARD_API_VERSIONS
+
 
-    # Check if it's a standard group
-    return api_version in standard_groups
+def _intern(value):
+    """Intern string values; anything else is returned unchanged."""
+    return sys.intern(value) if type(value) is str else value
 
 
 def extract_resource_info(doc):
@@ -225,32 +413,49 @@ def extract_resource_info(doc):
         return None
 
     # Extract group from apiVersion (e.g., "cert-manager.io/v1" -> "cert-manager.io")
-    group = api_version.split('/')[0] if '/' in api_version else 'core'
-    version = api_version.split('/')[-1]
+    # in a single scan; the version is whatever follows the last '/'
+    group, sep, version = api_version.partition('/')
+    if not sep:
+        group, version = 'core', api_version
+    elif '/' in version:
+        version = version.rpartition('/')[2]
 
-    is_crd = not is_standard_k8s_resource(api_version, kind)
+    is_crd = not is_standard_k8s_resource(api_version)
 
+    metadata = doc.get('metadata')
+
+    # Charts repeat the same few kinds and apiVersions; share one string each
     return {
-        'kind': kind,
-        'apiVersion': api_version,
-        'group': group,
-        'version': version,
+        'kind': _intern(kind),
+        'apiVersion': _intern(api_version),
+        'group': _intern(group),
+        'version': _intern(version),
         'isCRD': is_crd,
-        'name': doc.get('metadata', {}).get('name', 'unnamed')
+        'name': metadata.get('name', 'unnamed') if metadata else 'unnamed'
     }
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: detect_crd.py <yaml-file>", file=sys.stderr)
-        sys.exit(1)
+def write_json(data):
+    """Write data to stdout as indented UTF-8 JSON, using orjson when available."""
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
 
-    file_path = sys.argv[1]
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    sys.stdout.buffer.write(payload + b'\n')
 
-    if not Path(file_path).exists():
-        print(f"File not found: {file_path}", file=sys.stderr)
-        sys.exit(1)
 
+def detect_file(file_path):
+    """
+    Parse one YAML file and extract its resources.
+
+    Returns:
+        tuple: (list of resource dicts, list of parse errors, parsed document count)
+    """
     documents, parse_errors = parse_yaml_file(file_path)
     resources = []
 
@@ -259,20 +464,79 @@ def main():
         if resource_info:
             resources.append(resource_info)
 
-    # Build output with both resources and any parse errors
-    output = {
+    return resources, parse_errors, len(documents)
+
+
+def build_output(resources, parse_errors, parsed_count):
+    """Build the JSON document with resources, parse errors and a summary."""
+    return {
         'resources': resources,
         'parseErrors': parse_errors,
         'summary': {
-            'totalDocuments': len(documents) + len(parse_errors),
-            'parsedSuccessfully': len(documents),
+            'totalDocuments': parsed_count + len(parse_errors),
+            'parsedSuccessfully': parsed_count,
             'parseErrors': len(parse_errors),
             'crdsDetected': sum(1 for r in resources if r.get('isCRD', False))
         }
     }
 
-    # Output as JSON for easy parsing
-    print(json.dumps(output, indent=2))
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: detect_crd.py <yaml-file> [yaml-file ...]", file=sys.stderr)
+        sys.exit(1)
+
+    file_paths = sys.argv[1:]
+
+    if len(file_paths) == 1:
+        file_path = file_paths[0]
+
+        if not Path(file_path).exists():
+            print(f"File not found: {file_path}", file=sys.stderr)
+            sys.exit(1)
+
+        # Output as JSON for easy parsing
+        write_json(build_output(*detect_file(file_path)))
+        return
+
+    # Several files: parse them in worker processes, since YAML parsing is
+    # CPU-bound and files are independent, then merge the results in order
+    existing = []
+    has_errors = False
+    for file_path in file_paths:
+        if Path(file_path).exists():
+            existing.append(file_path)
+        else:
+            print(f"File not found: {file_path}", file=sys.stderr)
+            has_errors = True
+
+    if len(existing) > 1:
+        # Fail once here rather than in every worker if PyYAML is missing
+        _import_yaml()
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(len(existing), os.cpu_count() or 1)) as executor:
+            results = list(executor.map(detect_file, existing))
+    else:
+        results = [detect_file(file_path) for file_path in existing]
+
+    resources = []
+    parse_errors = []
+    parsed_count = 0
+    for file_path, (file_resources, file_errors, file_parsed) in zip(existing, results):
+        for item in file_resources:
+            item['file'] = file_path
+        for item in file_errors:
+            item['file'] = file_path
+        resources.extend(file_resources)
+        parse_errors.extend(file_errors)
+        parsed_count += file_parsed
+
+    output = build_output(resources, parse_errors, parsed_count)
+    output['summary']['filesScanned'] = len(existing)
+    write_json(output)
+
+    if has_errors:
+        sys.exit(1)
 
 
 if __name__ == '__main__':
@@ -9,16 +9,14 @@ PYTHON_SCRIPT="$SCRIPT_DIR/detect_crd.py"
 
 # Check if we have arguments
 if [ $# -lt 1 ]; then
-    echo "Usage: detect_crd_wrapper.sh <yaml-file>" >&2
+    echo "Usage: detect_crd_wrapper.sh <yaml-file> [yaml-file ...]" >&2
     exit 1
 fi
 
-YAML_FILE="$1"
-
 # Try to run with system Python first
 if python3 -c "import yaml" 2>/dev/null; then
     # PyYAML is available, run directly
-    python3 "$PYTHON_SCRIPT" "$YAML_FILE"
+    python3 "$PYTHON_SCRIPT" "$@"
     exit $?
 fi
 
@@ -34,6 +32,6 @@ source "$TEMP_VENV/bin/activate" >&2
 pip install --quiet pyyaml >&2
 
 # Run the script
-python3 "$PYTHON_SCRIPT" "$YAML_FILE"
+python3 "$PYTHON_SCRIPT" "$@"
 
 # Cleanup happens automatically via trap